@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+import urllib.parse
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+from diagnostico import instrumentar_engine
+
+# === CONFIGURAR CONEXAO COM SUPABASE (POSTGRESQL - POOLER) ===
+load_dotenv(dotenv_path=".env")
+
+SUPABASE_CONFIG = {
+    "usuario": os.getenv("USUARIO"),
+    "senha": urllib.parse.quote_plus(os.getenv("SENHA", "")),
+    "host": os.getenv("HOST"),
+    "porta": os.getenv("PORTA"),
+    "banco": os.getenv("BANCO")
+}
+
+# Ajustes do pool (podem ser sobrescritos no .env)
+POOL_CONFIG = {
+    "pool_size": int(os.getenv("POOL_TAMANHO", "5")),
+    "max_overflow": int(os.getenv("POOL_EXTRA", "10")),
+    "pool_timeout": int(os.getenv("POOL_TIMEOUT", "30")),
+    # O pooler do Supabase derruba conexões ociosas: recicla antes disso
+    "pool_recycle": int(os.getenv("POOL_RECICLAR", "1800")),
+}
+
+
+# === ESTATISTICAS DO POOL ===
+class EstatisticasPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.conexoes_abertas = 0
+            self.conexoes_fechadas = 0
+            self.conexoes_invalidadas = 0
+            self.espera_total = 0.0
+            self.espera_maxima = 0.0
+
+    def somar(self, campo, valor=1):
+        with self._lock:
+            setattr(self, campo, getattr(self, campo) + valor)
+
+    def registrar_espera(self, segundos):
+        with self._lock:
+            self.espera_total += segundos
+            self.espera_maxima = max(self.espera_maxima, segundos)
+
+    def resumo(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "conexoes_abertas": self.conexoes_abertas,
+                "conexoes_fechadas": self.conexoes_fechadas,
+                "conexoes_invalidadas": self.conexoes_invalidadas,
+                "espera_media_ms": round(1000 * self.espera_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "espera_maxima_ms": round(1000 * self.espera_maxima, 3),
+            }
+
+
+ESTATISTICAS = EstatisticasPool()
+
+
+class PoolMonitorado(QueuePool):
+    # Mede o tempo até conseguir uma conexão (fila do pool + abertura + pre-ping)
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            ESTATISTICAS.registrar_espera(time.perf_counter() - inicio)
+
+
+def _registrar_eventos(engine):
+    pool = engine.pool
+    event.listen(pool, "checkout", lambda *a: ESTATISTICAS.somar("checkouts"))
+    event.listen(pool, "checkin", lambda *a: ESTATISTICAS.somar("checkins"))
+    event.listen(pool, "connect", lambda *a: ESTATISTICAS.somar("conexoes_abertas"))
+    event.listen(pool, "close", lambda *a: ESTATISTICAS.somar("conexoes_fechadas"))
+    event.listen(pool, "invalidate", lambda *a: ESTATISTICAS.somar("conexoes_invalidadas"))
+
+
+def url_banco():
+    # DATABASE_URL permite apontar para um Postgres/SQLite local (testes, benchmarks)
+    return os.getenv("DATABASE_URL") or (
+        f"postgresql+psycopg2://{SUPABASE_CONFIG['usuario']}:{SUPABASE_CONFIG['senha']}"
+        f"@{SUPABASE_CONFIG['host']}:{SUPABASE_CONFIG['porta']}/{SUPABASE_CONFIG['banco']}"
+    )
+
+
+def conectar(url=None):
+    url = url or url_banco()
+    if url.startswith("sqlite"):
+        return instrumentar_engine(create_engine(url))
+
+    # executemany em lotes (execute_batch) para os UPDATEs em massa
+    engine = create_engine(
+        url,
+        connect_args={"client_encoding": "utf8"},
+        executemany_mode="values_plus_batch",
+        executemany_batch_page_size=500,
+        poolclass=PoolMonitorado,
+        pool_pre_ping=True,
+        **POOL_CONFIG
+    )
+    _registrar_eventos(engine)
+    return instrumentar_engine(engine)
+
+
+# === ENGINE COMPARTILHADA DO PROCESSO ===
+# O Streamlit reexecuta o script a cada interação, mas os módulos importados
+# ficam em cache: a engine criada aqui vale para todos os reruns e sessões.
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def obter_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = conectar()
+    return _engine
+
+
+def estatisticas_pool():
+    resumo = ESTATISTICAS.resumo()
+    if _engine is not None and isinstance(_engine.pool, QueuePool):
+        pool = _engine.pool
+        resumo.update({
+            "tamanho": pool.size(),
+            "em_uso": pool.checkedout(),
+            "ociosas": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+    return resumo
@@ -0,0 +1,101 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select, text
+
+from calendario import calcular_cor_prioridade, calcular_data_entrega
+from esquema import VALORES_REFERENCIA, criar_esquema, itens_pedido, pedidos, producao
+from gerador_pdf import DESCRICOES, HOSPITAIS
+
+# === BANCO LOCAL SEMEADO PARA OS BENCHMARKS ===
+# pedidos -> itens_pedido -> producao (uma linha de produção por item), com
+# valores sorteados por uma semente fixa: a mesma semente gera o mesmo banco.
+
+DATA_BASE = datetime.date(2024, 6, 3)  # "hoje" dos cenários, para resultados comparáveis
+ITENS_POR_PEDIDO = 20
+LINHAS_POR_INSERT = 5000
+
+
+def _inserir(conn, tabela, df):
+    registros = df.astype(object).where(df.notna(), None).to_dict("records")
+    for i in range(0, len(registros), LINHAS_POR_INSERT):
+        conn.execute(tabela.insert(), registros[i:i + LINHAS_POR_INSERT])
+
+
+def _limpar(conn):
+    for tabela in (producao, itens_pedido, pedidos):
+        conn.execute(tabela.delete())
+
+
+def _ajustar_sequencias(conn):
+    # Ids gravados explicitamente: no Postgres as sequências precisam acompanhar
+    if conn.dialect.name == "postgresql":
+        for tabela in ("pedidos", "itens_pedido", "producao"):
+            conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), COALESCE(MAX(id), 1)) FROM {tabela}"))
+
+
+def gerar_quadros(n_producao, semente=42):
+    rng = np.random.default_rng(semente)
+    n_pedidos = -(-n_producao // ITENS_POR_PEDIDO)
+
+    emissao = pd.Timestamp("2024-01-02") + pd.to_timedelta(rng.integers(0, 150, n_pedidos), unit="D")
+    df_pedidos = pd.DataFrame({
+        "id": np.arange(1, n_pedidos + 1),
+        "numero_pedido": (4500000000 + np.arange(1, n_pedidos + 1)).astype(str),
+        "data_emissao": emissao,
+        "hospital": np.array(HOSPITAIS, dtype=object)[rng.integers(0, len(HOSPITAIS), n_pedidos)],
+        "endereco_entrega": "RUA SINTETICA 100",
+        "estado": "RECIFE",
+        "uf": "PE",
+    })
+
+    id_pedido = np.repeat(df_pedidos["id"].to_numpy(), ITENS_POR_PEDIDO)[:n_producao]
+    df_itens = pd.DataFrame({
+        "id": np.arange(1, n_producao + 1),
+        "id_pedido": id_pedido,
+        "codigo_material": rng.integers(100000, 999999, n_producao).astype(str),
+        "descricao": np.array(DESCRICOES, dtype=object)[rng.integers(0, len(DESCRICOES), n_producao)],
+        "quantidade": rng.integers(1, 500, n_producao),
+        "valor_unitario": rng.uniform(1, 300, n_producao).round(3),
+        "data_entrega": emissao[id_pedido - 1] + pd.to_timedelta(rng.integers(20, 60, n_producao), unit="D"),
+    })
+
+    def sorteio(valores, nulos=0.2):
+        escolha = np.array(valores, dtype=object)[rng.integers(0, len(valores), n_producao)]
+        escolha[rng.random(n_producao) < nulos] = None
+        return escolha
+
+    entrega = calcular_data_entrega(pd.Series(emissao[id_pedido - 1]))
+    df_producao = pd.DataFrame({
+        "id": np.arange(1, n_producao + 1),
+        "id_item_pedido": df_itens["id"],
+        "status_tecido": sorteio(VALORES_REFERENCIA["status_tecido"]),
+        "faturamento": sorteio(VALORES_REFERENCIA["status_faturamento"]),
+        "logistica": sorteio(VALORES_REFERENCIA["logistica"]),
+        "nota_fiscal": sorteio([str(n) for n in range(10000, 10100)], nulos=0.6),
+        "ordem_fabricacao": sorteio([f"OF{n}" for n in range(100)], nulos=0.3),
+        "quantidade_op": rng.integers(1, 500, n_producao),
+        "consumo": rng.uniform(0.1, 5, n_producao).round(2),
+        "tecido": sorteio(["TNT", "ALGODAO", "MICROFIBRA", "OXFORD"]),
+        "data_entrega": pd.to_datetime(entrega).dt.date.to_numpy(),
+        "cor_prioridade": calcular_cor_prioridade(entrega, DATA_BASE).to_numpy(),
+    })
+    return df_pedidos, df_itens, df_producao
+
+
+def popular_banco(engine, n_producao, semente=42):
+    # Reaproveita o banco se já tiver exatamente n_producao linhas de produção
+    criar_esquema(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(producao)).scalar() == n_producao:
+            return False
+
+    df_pedidos, df_itens, df_producao = gerar_quadros(n_producao, semente)
+    with engine.begin() as conn:
+        _limpar(conn)
+        _inserir(conn, pedidos, df_pedidos)
+        _inserir(conn, itens_pedido, df_itens)
+        _inserir(conn, producao, df_producao)
+        _ajustar_sequencias(conn)
+    return True
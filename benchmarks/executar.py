@@ -0,0 +1,282 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Os módulos do app ficam na raiz do repositório
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import fitz  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import sqlalchemy  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from banco import conectar  # noqa: E402
+from base_local import DATA_BASE, popular_banco  # noqa: E402
+from cache import invalidar  # noqa: E402
+from extracao_pdf import extrair_dados_pdf  # noqa: E402
+from gerador_pdf import gerar_pedido_pdf  # noqa: E402
+from grade_alteracoes import salvar_diferencas  # noqa: E402
+from paginacao import CONSULTA_ACOMPANHAMENTO, CONSULTA_TABELA_GERAL  # noqa: E402
+from persistencia import salvar_pedidos  # noqa: E402
+from prioridade import SQL_BASE, calcular_alteracoes, gravar_alteracoes, recalcular_prioridades  # noqa: E402
+from quadros import bytes_payload, memoria  # noqa: E402
+
+# === SUITE DE BENCHMARKS ===
+# Uso:
+#   python benchmarks/executar.py                          # SQLite em benchmarks/dados/
+#   python benchmarks/executar.py --tamanhos 1000 10000 --saida resultado.json
+#   python benchmarks/executar.py --database-url postgresql://localhost/bench
+#   python benchmarks/executar.py --comparar anterior.json
+# Cenários que gravam rodam dentro de uma transação desfeita no fim, então o
+# banco semeado continua igual entre repetições e entre execuções.
+
+PASTA_DADOS = Path(__file__).resolve().parent / "dados"
+
+
+def medir(funcao, repeticoes):
+    # Uma execução de aquecimento, depois "repeticoes" medidas (em ms)
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return {
+        "repeticoes": repeticoes,
+        "min_ms": round(tempos[0], 3),
+        "mediana_ms": round(statistics.median(tempos), 3),
+        "p95_ms": round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 3),
+        "max_ms": round(tempos[-1], 3),
+    }
+
+
+def em_transacao_desfeita(engine, funcao):
+    def executar():
+        with engine.connect() as conn:
+            transacao = conn.begin()
+            try:
+                return funcao(conn)
+            finally:
+                transacao.rollback()
+    return executar
+
+
+# === CENARIOS ===
+def cenario_extracao(pdfs, repeticoes):
+    itens = sum(len(extrair_dados_pdf(conteudo)[1]) for conteudo in pdfs)
+    paginas = sum(fitz.open(stream=conteudo, filetype="pdf").page_count for conteudo in pdfs)
+    resultado = medir(lambda: [extrair_dados_pdf(conteudo) for conteudo in pdfs], repeticoes)
+    segundos = resultado["mediana_ms"] / 1000
+    resultado.update({
+        "pdfs": len(pdfs),
+        "paginas": paginas,
+        "itens": itens,
+        "pdfs_por_s": round(len(pdfs) / segundos, 1),
+        "paginas_por_s": round(paginas / segundos, 1),
+        "itens_por_s": round(itens / segundos, 1),
+    })
+    return resultado
+
+
+def cenario_importacao(engine, pedidos_extraidos, repeticoes):
+    # Latência de gravar um pedido (cabeçalho + itens), como no Upload de arquivo único
+    pedido = pedidos_extraidos[0]
+    resultado = medir(em_transacao_desfeita(engine, lambda conn: salvar_pedidos(conn, [pedido])), repeticoes)
+    resultado["itens_por_pedido"] = len(pedido[1])
+    lote = medir(em_transacao_desfeita(engine, lambda conn: salvar_pedidos(conn, pedidos_extraidos)), repeticoes)
+    resultado["lote"] = {"pedidos": len(pedidos_extraidos), **lote}
+    return resultado
+
+
+def cenario_prioridade_completa(engine, repeticoes):
+    # Atualização diária com "hoje" uma semana depois da semeadura: parte das cores muda
+    hoje = DATA_BASE + datetime.timedelta(days=7)
+    alteradas = []
+
+    def recalcular(conn):
+        df = pd.read_sql(text(SQL_BASE), conn)
+        alteradas.append(gravar_alteracoes(conn, calcular_alteracoes(df, hoje)))
+
+    resultado = medir(em_transacao_desfeita(engine, recalcular), repeticoes)
+    resultado["linhas_alteradas"] = alteradas[-1]
+    return resultado
+
+
+def cenario_prioridade_item(engine, repeticoes):
+    # Caminho do envio da Produção: recálculo de uma única linha
+    return medir(em_transacao_desfeita(engine, lambda conn: recalcular_prioridades(conn, [1])), repeticoes)
+
+
+def cenario_salvar_acompanhamento(engine, repeticoes, tamanho_pagina=100, fracao_editada=0.1):
+    invalidar()
+    original, _ = CONSULTA_ACOMPANHAMENTO.pagina(engine, tamanho=tamanho_pagina)
+    editado = original.copy()
+    rng = np.random.default_rng(7)
+    linhas = rng.choice(len(editado), max(1, int(len(editado) * fracao_editada)), replace=False)
+    editado.loc[editado.index[linhas], "nota_fiscal"] = "NF-BENCH"
+    editado.loc[editado.index[linhas], "quantidade_op"] = 999
+
+    resultado = medir(em_transacao_desfeita(engine, lambda conn: salvar_diferencas(conn, original, editado)), repeticoes)
+    resultado.update({"linhas_pagina": len(original), "linhas_editadas": len(linhas)})
+    return resultado
+
+
+def cenario_tabela_geral(engine, repeticoes, tamanho_pagina=100):
+    # Sem cache: cada repetição vai ao banco, como a primeira visita à página
+    def primeira_pagina():
+        invalidar()
+        CONSULTA_TABELA_GERAL.pagina(engine, tamanho=tamanho_pagina)
+        CONSULTA_TABELA_GERAL.total(engine)
+
+    def pagina_filtrada():
+        invalidar()
+        filtros = {"status_tecido": "corta"}
+        CONSULTA_TABELA_GERAL.pagina(engine, filtros, ("data_entrega", True), tamanho=tamanho_pagina)
+        CONSULTA_TABELA_GERAL.total(engine, filtros)
+
+    return {
+        "primeira_pagina": medir(primeira_pagina, repeticoes),
+        "filtrada_ordenada": medir(pagina_filtrada, repeticoes),
+    }
+
+
+def cenario_quadro_grade(engine, tamanho_pagina=100):
+    # Tamanhos do quadro da Tabela Geral: SELECT * com os tipos padrão do pandas
+    # (como antes) contra colunas exibidas + category/inteiros menores.
+    # Tabela inteira (o que ia ao navegador sem paginação) e uma página.
+    consulta = CONSULTA_TABELA_GERAL
+    invalidar()
+    formas = {
+        "completo": lambda sql: pd.read_sql(text(sql), engine),
+        "compacto": lambda sql: consulta.compactar(pd.read_sql(text(sql), engine)),
+    }
+    consultas = {
+        "completo": f"SELECT * FROM {consulta.origem}",
+        "compacto": f"SELECT {consulta.selecao} FROM {consulta.origem}",
+    }
+    resultado = {}
+    for alcance, limite in (("tabela", ""), ("pagina", f" LIMIT {tamanho_pagina}")):
+        for forma, carregar in formas.items():
+            inicio = time.perf_counter()
+            df = carregar(consultas[forma] + limite)
+            resultado[f"{alcance}_{forma}"] = {
+                "linhas": len(df),
+                "colunas": len(df.columns),
+                "carga_ms": round((time.perf_counter() - inicio) * 1000, 3),
+                "memoria_bytes": memoria(df),
+                "bytes_enviados": bytes_payload(df),
+            }
+        antes, depois = resultado[f"{alcance}_completo"], resultado[f"{alcance}_compacto"]
+        resultado[f"{alcance}_reducao"] = {
+            "memoria": round(1 - depois["memoria_bytes"] / antes["memoria_bytes"], 3),
+            "bytes_enviados": round(1 - depois["bytes_enviados"] / antes["bytes_enviados"], 3),
+        }
+    return resultado
+
+
+# === EXECUCAO ===
+def ambiente(engine):
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "banco": engine.dialect.name,
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sqlalchemy": sqlalchemy.__version__,
+        "pymupdf": fitz.VersionBind,
+    }
+
+
+def executar(args):
+    resultado = {
+        "inicio": datetime.datetime.now().isoformat(timespec="seconds"),
+        "parametros": vars(args).copy(),
+        "cenarios": {},
+    }
+
+    pdfs = [gerar_pedido_pdf(910000 + i, args.itens) for i in range(args.pdfs)]
+    pedidos_extraidos = [extrair_dados_pdf(conteudo) for conteudo in pdfs]
+    resultado["cenarios"]["extracao_pdf"] = cenario_extracao(pdfs, args.repeticoes)
+    print(f"extracao_pdf: {resultado['cenarios']['extracao_pdf']['mediana_ms']} ms", file=sys.stderr)
+
+    for tamanho in args.tamanhos:
+        if args.database_url:
+            engine = conectar(args.database_url)
+        else:
+            PASTA_DADOS.mkdir(exist_ok=True)
+            engine = conectar(f"sqlite:///{PASTA_DADOS / f'base_{tamanho}.db'}")
+        inicio = time.perf_counter()
+        semeado = popular_banco(engine, tamanho, args.semente)
+        resultado.setdefault("ambiente", ambiente(engine))
+
+        cenarios = {
+            "semeadura_s": round(time.perf_counter() - inicio, 3) if semeado else None,
+            "importacao_pedido": cenario_importacao(engine, pedidos_extraidos, args.repeticoes),
+            "prioridade_completa": cenario_prioridade_completa(engine, args.repeticoes),
+            "prioridade_item": cenario_prioridade_item(engine, args.repeticoes),
+            "salvar_acompanhamento": cenario_salvar_acompanhamento(engine, args.repeticoes),
+            "tabela_geral": cenario_tabela_geral(engine, args.repeticoes),
+            "quadro_grade": cenario_quadro_grade(engine),
+        }
+        resultado["cenarios"][f"producao_{tamanho}"] = cenarios
+        engine.dispose()
+        print(f"producao_{tamanho}: ok", file=sys.stderr)
+
+    resultado["fim"] = datetime.datetime.now().isoformat(timespec="seconds")
+    return resultado
+
+
+def _medianas(no, prefixo=""):
+    # Achata o resultado em {"cenario/sub": mediana_ms}
+    saida = {}
+    for chave, valor in no.items():
+        if isinstance(valor, dict):
+            if "mediana_ms" in valor:
+                saida[prefixo + chave] = valor["mediana_ms"]
+            saida.update(_medianas(valor, f"{prefixo}{chave}/"))
+    return saida
+
+
+def comparar(anterior, atual):
+    antes, depois = _medianas(anterior["cenarios"]), _medianas(atual["cenarios"])
+    linhas = []
+    for nome in sorted(antes.keys() & depois.keys()):
+        razao = depois[nome] / antes[nome] if antes[nome] else float("nan")
+        linhas.append(f"{nome:<55} {antes[nome]:>10.2f} {depois[nome]:>10.2f} {razao:>7.2f}x")
+    return "\n".join([f"{'cenario':<55} {'antes ms':>10} {'agora ms':>10} {'razao':>8}", *linhas])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do app de produção.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000], help="linhas de produção por banco")
+    parser.add_argument("--pdfs", type=int, default=20, help="PDFs sintéticos no cenário de extração")
+    parser.add_argument("--itens", type=int, default=200, help="itens por PDF sintético")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--database-url", default=None, help="banco a semear (padrão: SQLite por tamanho em benchmarks/dados)")
+    parser.add_argument("--saida", default=None, help="arquivo JSON de resultado (padrão: saída padrão)")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+
+    resultado = executar(args)
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2, default=str)
+    if args.saida:
+        Path(args.saida).write_text(texto, encoding="utf-8")
+    else:
+        print(texto)
+    if args.comparar:
+        print(comparar(json.loads(Path(args.comparar).read_text(encoding="utf-8")), resultado), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import fitz  # PyMuPDF
+
+# === GERADOR DE PEDIDOS DE COMPRA SINTETICOS ===
+# Produz PDFs no layout que extrair_dados_pdf espera (cabeçalho + linhas de
+# item). Determinístico para a mesma semente.
+
+HOSPITAIS = [
+    "HAPVIDA ASSISTENCIA MEDICA",
+    "HOSPITAL ILHA DO LEITE",
+    "HOSPITAL SAO LUIZ",
+    "HOSPITAL GUARARAPES",
+]
+
+DESCRICOES = [
+    "AVENTAL DESCARTAVEL MANGA LONGA",
+    "LENCOL DE ALGODAO SOLTEIRO",
+    "CAMISOLA HOSPITALAR ADULTO",
+    "CAMPO CIRURGICO SIMPLES",
+    "PIJAMA CIRURGICO AZUL",
+    "COBERTOR MICROFIBRA",
+    "FRONHA ALGODAO BRANCA",
+]
+
+
+def _numero_br(valor):
+    return f"{valor:.3f}".replace(".", ",")
+
+
+def linhas_pedido(numero_pedido, n_itens, semente=None):
+    rng = random.Random(semente if semente is not None else numero_pedido)
+    emissao = datetime.date(2024, 1, 2) + datetime.timedelta(days=rng.randrange(150))
+    linhas = [
+        "Pedido de Compra",
+        f"Nº Pedido: {numero_pedido}",
+        f"Data Emissão: {emissao:%d.%m.%Y}",
+        "Dados de Faturamento",
+        rng.choice(HOSPITAIS),
+        "Endereço de Entrega",
+        "HAM - HOSPITAL ILHA DO LEITE",
+        f"RUA SINTETICA {rng.randrange(1, 999)}",
+        "RECIFE - PE",
+    ]
+    for i in range(n_itens):
+        entrega = emissao + datetime.timedelta(days=rng.randrange(20, 60))
+        linhas.append(
+            f"{(i + 1) * 10:05d} {entrega:%d.%m.%Y} {rng.randrange(100000, 999999)} "
+            f"{rng.choice(DESCRICOES)} {rng.randrange(1, 500)},000 UD {_numero_br(rng.uniform(1, 300))}"
+        )
+    return linhas
+
+
+def gerar_pedido_pdf(numero_pedido, n_itens=50, linhas_por_pagina=40, semente=None):
+    # Devolve os bytes do PDF; o número de páginas é ceil((9 + n_itens) / linhas_por_pagina)
+    linhas = linhas_pedido(numero_pedido, n_itens, semente)
+    doc = fitz.open()
+    for inicio in range(0, len(linhas), linhas_por_pagina):
+        pagina = doc.new_page()
+        pagina.insert_text((40, 40), "\n".join(linhas[inicio:inicio + linhas_por_pagina]), fontsize=8)
+    conteudo = doc.tobytes()
+    doc.close()
+    return conteudo
+
+
+if __name__ == "__main__":
+    # Uso: python benchmarks/gerador_pdf.py <pasta> [quantidade] [itens por pedido]
+    import sys
+    from pathlib import Path
+
+    pasta = Path(sys.argv[1])
+    quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    n_itens = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    pasta.mkdir(parents=True, exist_ok=True)
+    for i in range(quantidade):
+        numero = 900000 + i
+        (pasta / f"pedido_{numero}.pdf").write_bytes(gerar_pedido_pdf(numero, n_itens))
+    print(f"{quantidade} PDF(s) gerados em {pasta}")
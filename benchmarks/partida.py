@@ -0,0 +1,128 @@
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# === BENCHMARK DE PARTIDA A FRIO E DE RERUN DAS PAGINAS ===
+# Cada medição roda num processo novo (importações a frio), com o AppTest do
+# Streamlit executando o script do app contra o banco SQLite semeado.
+# Uso:
+#   python benchmarks/partida.py                               # Home e Logística
+#   python benchmarks/partida.py --paginas "🏠 Home" "📥 Upload" --saida partida.json
+#   python benchmarks/partida.py --app /tmp/versao_antiga/projeto_hapvida.py   # comparar
+# Mede: primeira execução do script no processo (partida a frio), primeira
+# abertura da página e CPU por rerun com a página já aberta.
+
+RAIZ = Path(__file__).resolve().parent.parent
+PASTA_DADOS = Path(__file__).resolve().parent / "dados"
+MODULOS_PESADOS = ("fitz", "st_aggrid", "psycopg2", "importacao_lote", "extracao_pdf")
+
+
+def _filho(app, pagina, reruns):
+    # Roda dentro do processo medido: imprime um JSON com os tempos
+    inicio_importacao = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    importacao_streamlit = time.perf_counter() - inicio_importacao
+
+    at = AppTest.from_file(app, default_timeout=120)
+    parede, cpu = time.perf_counter(), time.process_time()
+    at.run()
+    partida = (time.perf_counter() - parede, time.process_time() - cpu)
+
+    parede, cpu = time.perf_counter(), time.process_time()
+    at.sidebar.radio[0].set_value(pagina).run()
+    abertura = (time.perf_counter() - parede, time.process_time() - cpu)
+    erros = [str(e.value) for e in at.exception]
+
+    cpu_reruns, parede_reruns = [], []
+    for _ in range(reruns):
+        parede, cpu = time.perf_counter(), time.process_time()
+        at.run()
+        parede_reruns.append(time.perf_counter() - parede)
+        cpu_reruns.append(time.process_time() - cpu)
+
+    print(json.dumps({
+        "importacao_streamlit_ms": importacao_streamlit * 1000,
+        "partida_ms": partida[0] * 1000,
+        "partida_cpu_ms": partida[1] * 1000,
+        "abertura_ms": abertura[0] * 1000,
+        "abertura_cpu_ms": abertura[1] * 1000,
+        "rerun_ms": statistics.median(parede_reruns) * 1000,
+        "rerun_cpu_ms": statistics.median(cpu_reruns) * 1000,
+        "modulos_carregados": [m for m in MODULOS_PESADOS if m in sys.modules],
+        "erros": erros,
+    }))
+
+
+def medir_pagina(app, pagina, repeticoes, reruns, database_url):
+    # PYTHONPATH: os módulos importados pelo app são os da pasta do próprio app
+    pasta_app = str(Path(app).resolve().parent)
+    ambiente = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=pasta_app, PYTHONWARNINGS="ignore")
+    amostras = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, __file__, "--filho", app, pagina, str(reruns)],
+            capture_output=True, text=True, env=ambiente, cwd=pasta_app, check=True,
+        )
+        amostras.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+
+    resultado = {
+        chave: round(statistics.median(a[chave] for a in amostras), 2)
+        for chave in amostras[0] if chave.endswith("_ms")
+    }
+    resultado["modulos_carregados"] = amostras[-1]["modulos_carregados"]
+    resultado["erros"] = amostras[-1]["erros"]
+    return resultado
+
+
+def main(argv=None):
+    if argv is None and len(sys.argv) > 1 and sys.argv[1] == "--filho":
+        _filho(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+
+    parser = argparse.ArgumentParser(description="Partida a frio e custo de rerun das páginas.")
+    parser.add_argument("--app", default=str(RAIZ / "projeto_hapvida.py"), help="script do app a medir")
+    parser.add_argument("--paginas", nargs="+", default=["🏠 Home", "🚚 Logística"])
+    parser.add_argument("--repeticoes", type=int, default=5, help="processos novos por página")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns medidos em cada processo")
+    parser.add_argument("--linhas", type=int, default=1000, help="linhas de produção do banco semeado")
+    parser.add_argument("--database-url", default=None, help="banco usado pelo app (padrão: SQLite semeado)")
+    parser.add_argument("--saida", default=None, help="arquivo JSON de resultado (padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url
+    if database_url is None:
+        sys.path.insert(0, str(RAIZ))
+        from banco import conectar
+        from base_local import popular_banco
+
+        PASTA_DADOS.mkdir(exist_ok=True)
+        database_url = f"sqlite:///{PASTA_DADOS / f'base_{args.linhas}.db'}"
+        engine = conectar(database_url)
+        popular_banco(engine, args.linhas)
+        engine.dispose()
+
+    resultado = {
+        "inicio": datetime.datetime.now().isoformat(timespec="seconds"),
+        "app": args.app,
+        "parametros": {"repeticoes": args.repeticoes, "reruns": args.reruns, "database_url": database_url},
+        "paginas": {},
+    }
+    for pagina in args.paginas:
+        resultado["paginas"][pagina] = medir_pagina(args.app, pagina, args.repeticoes, args.reruns, database_url)
+        print(f"{pagina}: ok", file=sys.stderr)
+
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.saida:
+        Path(args.saida).write_text(texto, encoding="utf-8")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
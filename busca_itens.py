@@ -0,0 +1,133 @@
+import threading
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from cache import CONSULTAS, CacheLRU
+from tarefas import TAREFAS
+
+# === INDICE DE BUSCA DOS ITENS DE PEDIDO ===
+# Índice de prefixos em memória: cada palavra de "numero_pedido descricao"
+# vira uma entrada de um vetor ordenado; a busca de um prefixo é uma busca
+# binária (searchsorted) e o resto do custo é proporcional aos itens que
+# casam com o termo mais seletivo, não ao tamanho do catálogo.
+# Quando pedidos/itens são gravados o índice é reconstruído em segundo plano
+# (tarefa "indice_itens"); até terminar, as buscas usam o índice anterior.
+
+# Marca de "índice em dia": sai do cache com invalidar("pedidos"/"itens_pedido")
+# e, como as consultas de tabela, expira sozinha: gravações de outro processo
+# (importador, outra instância do app) não passam pelo invalidar() deste
+INDICES = CacheLRU(max_itens=1, ttl=CONSULTAS.ttl)
+
+SQL_ITENS = """
+    SELECT ip.id, p.numero_pedido, ip.descricao
+    FROM itens_pedido ip
+    JOIN pedidos p ON p.id = ip.id_pedido
+    ORDER BY p.numero_pedido DESC, ip.id DESC
+"""
+
+
+def normalizar(texto):
+    # Maiúsculas e sem acentos: "pavão" encontra "PAVAO" e vice-versa
+    texto = unicodedata.normalize("NFKD", str(texto).upper())
+    return texto.encode("ascii", "ignore").decode("ascii")
+
+
+class IndiceItens:
+    def __init__(self, df):
+        # df já vem na ordem de exibição (pedidos mais recentes primeiro)
+        self.ids = df["id"].astype(int).to_numpy()
+        self.rotulos = (df["numero_pedido"].astype(str) + " - " + df["descricao"].fillna("").astype(str)).to_numpy()
+
+        normalizados = (
+            pd.Series(self.rotulos, dtype=object).str.upper().str.normalize("NFKD")
+            .str.encode("ascii", "ignore").str.decode("ascii")
+        )
+        self.palavras_item = normalizados.str.split().tolist()
+        palavras = pd.Series(self.palavras_item, dtype=object).explode().dropna()
+        ordem = np.argsort(palavras.to_numpy(dtype=str), kind="stable")
+        # dtype object: a busca não converte o vetor inteiro para o tamanho do prefixo
+        self.palavras = palavras.to_numpy(dtype=object)[ordem]
+        self.posicoes = palavras.index.to_numpy()[ordem]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _faixa(self, prefixo):
+        inicio = np.searchsorted(self.palavras, prefixo, side="left")
+        fim = np.searchsorted(self.palavras, prefixo + "\uffff", side="left")
+        return inicio, fim
+
+    def buscar(self, consulta, limite=20):
+        # Cada palavra digitada deve ser prefixo de alguma palavra do item.
+        # Devolve [(id do item, rótulo)] na ordem de exibição.
+        termos = normalizar(consulta).split()
+        if not termos:
+            return []
+
+        # Parte do termo mais seletivo e confere os demais só até completar o limite
+        faixas = sorted(((self._faixa(termo), termo) for termo in termos), key=lambda f: f[0][1] - f[0][0])
+        (inicio, fim), _ = faixas[0]
+        outros = [termo for _, termo in faixas[1:]]
+
+        resultado = []
+        for p in _unicas(self.posicoes[inicio:fim]):
+            palavras = self.palavras_item[p]
+            if all(any(w.startswith(t) for w in palavras) for t in outros):
+                resultado.append((int(self.ids[p]), self.rotulos[p]))
+                if len(resultado) >= limite:
+                    break
+        return resultado
+
+
+def _unicas(posicoes):
+    # Posições sem repetição (um item pode ter várias palavras com o prefixo),
+    # em ordem crescente, que é a ordem de exibição. Ordena e descarta as
+    # repetidas: O(m log m) nas m ocorrências do prefixo (o np.unique do
+    # numpy 2.x faz o mesmo, porém bem mais devagar)
+    posicoes = np.sort(posicoes)
+    return posicoes[np.concatenate(([True], posicoes[1:] != posicoes[:-1]))] if len(posicoes) else posicoes
+
+
+_atual = None
+_reconstruindo = False
+_lock = threading.Lock()
+
+
+def _construir(progresso, engine):
+    global _atual, _reconstruindo
+    try:
+        # Marca antes de ler: uma gravação durante a leitura derruba a marca e
+        # agenda outra reconstrução
+        INDICES.guardar("itens", True, ("itens_pedido", "pedidos"))
+        progresso(0.1, "Lendo itens de pedido...")
+        indice = IndiceItens(pd.read_sql(text(SQL_ITENS), con=engine))
+        _atual = indice
+        progresso(1.0, f"{len(indice)} item(ns) indexados")
+        return len(indice)
+    except Exception:
+        INDICES.invalidar()  # a próxima visita tenta de novo
+        raise
+    finally:
+        _reconstruindo = False
+
+
+def indice_desatualizado():
+    return _reconstruindo
+
+
+def obter_indice(engine):
+    # Só a primeira carga do processo espera a leitura; depois de uma gravação
+    # o índice anterior continua servindo enquanto o novo é montado
+    global _reconstruindo
+    if INDICES.obter("itens") is None:
+        if _atual is None:
+            _construir(lambda *_: None, engine)
+        else:
+            with _lock:
+                agendar, _reconstruindo = not _reconstruindo, True
+            if agendar:
+                TAREFAS.submeter("indice_itens", "Reconstrução do índice de itens", _construir, engine)
+    return _atual
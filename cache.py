@@ -0,0 +1,94 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+from sqlalchemy import text
+
+# === CACHE LRU COM TTL E INVALIDACAO POR TABELA ===
+# Vive no módulo, então é compartilhado por todas as sessões do processo.
+# Cada entrada guarda as tabelas de que depende; quem grava chama invalidar().
+
+
+class CacheLRU:
+    # Todas as instâncias, para que invalidar() alcance cada cache do processo
+    instancias = weakref.WeakSet()
+
+    def __init__(self, max_itens=64, ttl=300, max_bytes=None):
+        # ttl=None: a entrada só sai por invalidação ou por falta de espaço.
+        # max_bytes limita a soma dos tamanhos informados em guardar().
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()  # chave -> (expira_em, tabelas, valor, tamanho)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        CacheLRU.instancias.add(self)
+
+    def _remover(self, chave):
+        self._bytes -= self._itens.pop(chave)[3]
+
+    def obter(self, chave):
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is None or (entrada[0] is not None and entrada[0] < time.monotonic()):
+                if entrada is not None:
+                    self._remover(chave)
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return entrada[2]
+
+    def guardar(self, chave, valor, tabelas=(), tamanho=0):
+        if self.max_bytes is not None and tamanho > self.max_bytes:
+            return
+        expira_em = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (expira_em, frozenset(tabelas), valor, tamanho)
+            self._bytes += tamanho
+            while len(self._itens) > self.max_itens or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remover(next(iter(self._itens)))
+
+    def invalidar(self, *tabelas):
+        # Sem argumentos limpa tudo
+        with self._lock:
+            if not tabelas:
+                self._itens.clear()
+                self._bytes = 0
+                return
+            alvo = set(tabelas)
+            for chave in [c for c, entrada in self._itens.items() if entrada[1] & alvo]:
+                self._remover(chave)
+
+    def resumo(self):
+        with self._lock:
+            return {"itens": len(self._itens), "bytes": self._bytes, "acertos": self.acertos, "falhas": self.falhas}
+
+
+# === CACHE DAS CONSULTAS DAS PAGINAS DE LEITURA ===
+CONSULTAS = CacheLRU(max_itens=32, ttl=120)
+
+
+def ler_sql(engine, sql, tabelas, params=None, converter=None):
+    # "tabelas" lista as tabelas lidas pela consulta, usadas na invalidação.
+    # converter(df), se informado, é aplicado uma vez, antes de guardar no cache.
+    chave = (sql, tuple(sorted((params or {}).items())))
+    df = CONSULTAS.obter(chave)
+    if df is None:
+        df = pd.read_sql(text(sql), con=engine, params=params)
+        if converter is not None:
+            df = converter(df)
+        CONSULTAS.guardar(chave, df, tabelas)
+    # Cópia: a página pode alterar o quadro sem afetar as outras sessões
+    return df.copy()
+
+
+def invalidar(*tabelas):
+    for cache in list(CacheLRU.instancias):
+        cache.invalidar(*tabelas)
@@ -0,0 +1,181 @@
+import datetime
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# === CALENDARIO DE DIAS UTEIS (VETORIZADO) ===
+# Os cálculos usam numpy.busday_offset sobre colunas inteiras de datas.
+# Sem feriados configurados o resultado é idêntico ao antigo laço dia a dia,
+# inclusive para deslocamentos negativos (a data volta inalterada).
+
+PULMAO_PADRAO = 30
+
+# Feriados nacionais de data fixa (mês, dia)
+FERIADOS_NACIONAIS_FIXOS = [
+    (1, 1),    # Confraternização Universal
+    (4, 21),   # Tiradentes
+    (5, 1),    # Dia do Trabalho
+    (9, 7),    # Independência
+    (10, 12),  # Nossa Senhora Aparecida
+    (11, 2),   # Finados
+    (11, 15),  # Proclamação da República
+    (11, 20),  # Consciência Negra
+    (12, 25),  # Natal
+]
+
+# Feriados de Pernambuco e do município do Recife
+FERIADOS_RECIFE_FIXOS = [
+    (3, 6),    # Data Magna de Pernambuco
+    (6, 24),   # São João
+    (7, 16),   # Nossa Senhora do Carmo
+    (12, 8),   # Nossa Senhora da Conceição
+]
+
+
+def _domingo_de_pascoa(ano):
+    # Algoritmo de Meeus/Jones/Butcher (calendário gregoriano)
+    a = ano % 19
+    b, c = divmod(ano, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes = (h + l - 7 * m + 114) // 31
+    dia = ((h + l - 7 * m + 114) % 31) + 1
+    return datetime.date(ano, mes, dia)
+
+
+def feriados_nacionais(ano):
+    pascoa = _domingo_de_pascoa(ano)
+    moveis = [
+        pascoa - datetime.timedelta(days=48),  # Carnaval (segunda)
+        pascoa - datetime.timedelta(days=47),  # Carnaval (terça)
+        pascoa - datetime.timedelta(days=2),   # Sexta-feira Santa
+        pascoa + datetime.timedelta(days=60),  # Corpus Christi
+    ]
+    return [datetime.date(ano, m, d) for m, d in FERIADOS_NACIONAIS_FIXOS] + moveis
+
+
+def feriados_recife(ano):
+    return feriados_nacionais(ano) + [datetime.date(ano, m, d) for m, d in FERIADOS_RECIFE_FIXOS]
+
+
+CALENDARIOS = {
+    "": lambda ano: [],
+    "nenhum": lambda ano: [],
+    "nacional": feriados_nacionais,
+    "recife": feriados_recife,
+}
+
+
+@lru_cache(maxsize=None)
+def montar_feriados(calendario="", extras="", ano_inicial=2000, ano_final=2100):
+    # "calendario" escolhe a lista base; "extras" são datas ISO separadas por vírgula
+    if calendario not in CALENDARIOS:
+        raise ValueError(f"Calendário de feriados desconhecido: {calendario!r}")
+    datas = []
+    for ano in range(ano_inicial, ano_final + 1):
+        datas.extend(CALENDARIOS[calendario](ano))
+    for extra in filter(None, (e.strip() for e in extras.split(","))):
+        datas.append(datetime.date.fromisoformat(extra))
+    return tuple(sorted(set(datas)))
+
+
+def feriados_configurados():
+    # Configuração via .env: FERIADOS=nenhum|nacional|recife e FERIADOS_EXTRAS=AAAA-MM-DD,...
+    return montar_feriados(
+        os.getenv("FERIADOS", "").strip().lower(),
+        os.getenv("FERIADOS_EXTRAS", "").strip(),
+    )
+
+
+@lru_cache(maxsize=8)
+def _calendario_numpy(feriados):
+    return np.busdaycalendar(weekmask="1111100", holidays=list(feriados))
+
+
+def _resolver_calendario(feriados):
+    if feriados is None:
+        feriados = feriados_configurados()
+    return _calendario_numpy(tuple(feriados))
+
+
+def _para_datas(valores):
+    # Aceita Series, Index, listas, datetime/date ou Timestamp; descarta o horário
+    if isinstance(valores, (np.ndarray, pd.Series)) and valores.dtype.kind == "M":
+        return np.asarray(valores, dtype="datetime64[D]")
+    return np.asarray(pd.to_datetime(pd.Series(valores)).values, dtype="datetime64[D]")
+
+
+def adicionar_dias_uteis_vetorizado(datas, dias_uteis, feriados=None):
+    # Equivalente vetorizado de adicionar_dias_uteis: a data inicial não conta,
+    # fins de semana/feriados são pulados. Como no laço antigo, dias_uteis <= 0
+    # devolve a própria data (os limites das cores em calcular_cor_prioridade
+    # dependem disso; mudar esse comportamento reclassifica as prioridades).
+    calendario = _resolver_calendario(feriados)
+    serie = isinstance(datas, pd.Series)
+    valores = _para_datas(datas if serie else np.atleast_1d(datas))
+
+    # Colunas reais têm poucas datas distintas: com deslocamento único,
+    # calcula uma vez por data e espalha o resultado pelas linhas
+    inverso = None
+    if np.ndim(dias_uteis) == 0:
+        inverso, valores = pd.factorize(valores, use_na_sentinel=False)
+        valores = np.asarray(valores, dtype="datetime64[D]")
+    dias = np.broadcast_to(np.asarray(dias_uteis, dtype="int64"), valores.shape)
+    nulos = np.isnat(valores)
+    base = np.where(nulos, np.datetime64("1970-01-01", "D"), valores)
+
+    # Partindo de um dia não útil, o primeiro passo já cai no dia útil seguinte;
+    # por isso o "roll" é para trás
+    resultado = base.copy()
+    avancar = dias > 0
+    if avancar.any():
+        resultado[avancar] = np.busday_offset(base[avancar], dias[avancar], roll="backward", busdaycal=calendario)
+    resultado[nulos] = np.datetime64("NaT")
+    if inverso is not None:
+        resultado = resultado[inverso]
+
+    if serie:
+        return pd.Series(resultado.astype("datetime64[ns]"), index=datas.index, name=datas.name)
+    return resultado
+
+
+def adicionar_dias_uteis(data_inicial, dias_uteis, feriados=None):
+    resultado = adicionar_dias_uteis_vetorizado([data_inicial], dias_uteis, feriados)[0]
+    return pd.Timestamp(resultado).date()
+
+
+def calcular_data_entrega(datas_emissao, pulmao=PULMAO_PADRAO, feriados=None):
+    return adicionar_dias_uteis_vetorizado(datas_emissao, pulmao, feriados)
+
+
+def calcular_cor_prioridade(datas_entrega, hoje=None, pulmao=PULMAO_PADRAO, feriados=None):
+    hoje = np.datetime64(hoje or datetime.date.today(), "D")
+    serie = isinstance(datas_entrega, pd.Series)
+    entrega = _para_datas(datas_entrega if serie else np.atleast_1d(datas_entrega))
+
+    # A cor depende só da data de entrega: avalia cada data distinta uma vez
+    codigos, unicas = pd.factorize(entrega, use_na_sentinel=False)
+    unicas = np.asarray(unicas, dtype="datetime64[D]")
+
+    limite_azul = adicionar_dias_uteis_vetorizado(unicas, -pulmao, feriados)
+    limite_verde = adicionar_dias_uteis_vetorizado(unicas, -int(pulmao * 0.66), feriados)
+    limite_amarelo = adicionar_dias_uteis_vetorizado(unicas, -int(pulmao * 0.33), feriados)
+
+    cores = np.select(
+        [hoje <= limite_azul, hoje <= limite_verde, hoje <= limite_amarelo, hoje <= unicas],
+        ["5.AZUL", "4.VERDE", "3.AMARELO", "2.VERMELHO"],
+        default="1.PRETO",
+    ).astype(object)
+    cores[np.isnat(unicas)] = None
+    cores = cores[codigos]
+
+    if serie:
+        return pd.Series(cores, index=datas_entrega.index, name="cor_prioridade")
+    return cores
@@ -0,0 +1,176 @@
+import collections
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import event
+
+# === INSTRUMENTACAO (SQL, EXECUCOES DE PAGINA, EXTRACAO DE PDF) ===
+# Cada medição vira um evento {quando, tipo, nome, duracao_ms, ...} num buffer
+# circular em memória (os mais antigos saem primeiro) e, se DIAG_LOG estiver
+# definido, também numa linha do arquivo JSON-lines.
+# Tipos: "sql" (comando no banco), "pagina" (execução do script de uma página),
+# "pdf" (leitura de PDF) e o que mais for medido com medir().
+
+MAX_EVENTOS = int(os.getenv("DIAG_MAX_EVENTOS", "5000"))
+ARQUIVO_LOG = os.getenv("DIAG_LOG")
+TAMANHO_SQL = 300  # caracteres guardados de cada comando
+
+_ESPACOS = re.compile(r"\s+")
+
+
+class Registro:
+    def __init__(self, max_eventos=MAX_EVENTOS, arquivo=ARQUIVO_LOG):
+        self.eventos = collections.deque(maxlen=max_eventos)
+        self.execucoes_por_sessao = collections.Counter()
+        self._lock = threading.Lock()
+        self._arquivo = open(arquivo, "a", encoding="utf-8", buffering=1) if arquivo else None
+
+    def registrar(self, tipo, nome, duracao_ms, **extra):
+        evento = {"quando": time.time(), "tipo": tipo, "nome": nome, "duracao_ms": round(duracao_ms, 3), **_contexto(), **extra}
+        with self._lock:
+            self.eventos.append(evento)
+            if tipo == "pagina" and evento.get("sessao"):
+                self.execucoes_por_sessao[evento["sessao"]] += 1
+            if self._arquivo:
+                self._arquivo.write(json.dumps(evento, ensure_ascii=False, default=str) + "\n")
+        return evento
+
+    def quadro(self, tipo=None):
+        with self._lock:
+            eventos = [e for e in self.eventos if tipo is None or e["tipo"] == tipo]
+        return pd.DataFrame(eventos)
+
+    def limpar(self):
+        with self._lock:
+            self.eventos.clear()
+            self.execucoes_por_sessao.clear()
+
+
+REGISTRO = Registro()
+
+
+# === CONTEXTO DA THREAD (PAGINA / SESSAO EM EXECUCAO) ===
+# O Streamlit roda cada sessão numa thread: os comandos SQL ficam associados
+# à página e à sessão que estavam executando.
+_local = threading.local()
+
+
+def _contexto():
+    return getattr(_local, "contexto", {})
+
+
+def iniciar_execucao(pagina, sessao=None):
+    _local.contexto = {"pagina": pagina, "sessao": sessao}
+    _local.inicio_execucao = time.perf_counter()
+
+
+def finalizar_execucao(**extra):
+    # Chamado no finally do script principal (projeto_hapvida.py): cobre st.stop()/st.rerun()
+    inicio = getattr(_local, "inicio_execucao", None)
+    if inicio is None:
+        return None
+    _local.inicio_execucao = None
+    contexto = _contexto()
+    evento = REGISTRO.registrar("pagina", contexto.get("pagina"), (time.perf_counter() - inicio) * 1000, **extra)
+    _local.contexto = {}
+    return evento
+
+
+@contextlib.contextmanager
+def medir(tipo, nome, **extra):
+    # Uso: with medir("pdf", "extrair_dados_pdf") as dados: ...; dados["itens"] = n
+    dados = dict(extra)
+    inicio = time.perf_counter()
+    try:
+        yield dados
+    except Exception as e:
+        dados["erro"] = type(e).__name__
+        raise
+    finally:
+        REGISTRO.registrar(tipo, nome, (time.perf_counter() - inicio) * 1000, **dados)
+
+
+# === EVENTOS DO SQLALCHEMY ===
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("diag_inicio", []).append(time.perf_counter())
+
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    pilha = conn.info.get("diag_inicio")
+    if not pilha:
+        return
+    duracao = (time.perf_counter() - pilha.pop()) * 1000
+    linhas = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+    comando = _ESPACOS.sub(" ", statement).strip()[:TAMANHO_SQL]
+    REGISTRO.registrar("sql", comando, duracao, linhas=linhas, executemany=executemany)
+
+
+def instrumentar_engine(engine):
+    if not event.contains(engine, "before_cursor_execute", _antes):
+        event.listen(engine, "before_cursor_execute", _antes)
+        event.listen(engine, "after_cursor_execute", _depois)
+    return engine
+
+
+# === RESUMOS PARA A PAGINA DE DIAGNOSTICO ===
+def _percentis(grupos):
+    return grupos["duracao_ms"].agg(
+        execucoes="count",
+        p50_ms="median",
+        p95_ms=lambda d: d.quantile(0.95),
+        max_ms="max",
+        total_ms="sum",
+    ).round(2)
+
+
+def consultas_lentas(limite=20):
+    df = REGISTRO.quadro("sql")
+    if df.empty:
+        return df
+    resumo = _percentis(df.groupby("nome"))
+    resumo["linhas_media"] = df.groupby("nome")["linhas"].mean().round(1)
+    return resumo.sort_values("max_ms", ascending=False).head(limite).reset_index().rename(columns={"nome": "comando"})
+
+
+def tempos_por_pagina():
+    df = REGISTRO.quadro("pagina")
+    if df.empty:
+        return df
+    resumo = _percentis(df.groupby("nome"))
+    sql = REGISTRO.quadro("sql")
+    if not sql.empty and "pagina" in sql:
+        resumo["sql_total_ms"] = sql.groupby("pagina")["duracao_ms"].sum().round(2)
+    return resumo.sort_values("p95_ms", ascending=False).reset_index().rename(columns={"nome": "pagina"})
+
+
+def execucoes_por_sessao():
+    with REGISTRO._lock:
+        contagem = dict(REGISTRO.execucoes_por_sessao)
+    df = REGISTRO.quadro("pagina")
+    ultimas = (
+        df.sort_values("quando").groupby("sessao").agg(ultima_pagina=("nome", "last"), ultima_vez=("quando", "last"))
+        if not df.empty else pd.DataFrame(columns=["ultima_pagina", "ultima_vez"])
+    )
+    resumo = pd.DataFrame({"execucoes": pd.Series(contagem, dtype="int64")}).join(ultimas)
+    resumo["ultima_vez"] = pd.to_datetime(resumo["ultima_vez"], unit="s")
+    return resumo.sort_values("execucoes", ascending=False).rename_axis("sessao").reset_index()
+
+
+def tamanhos_grades():
+    # Por grade: memória do quadro da página, bytes enviados por rerun e memória
+    # dos quadros da sessão (medianas e máximo, em KB)
+    df = REGISTRO.quadro("grade")
+    if df.empty or "bytes_enviados" not in df:
+        return pd.DataFrame()
+    grupos = df.groupby("nome")
+    resumo = _percentis(grupos)[["execucoes", "p50_ms"]]
+    resumo["linhas"] = grupos["linhas"].median()
+    for coluna in ("memoria_quadro", "bytes_enviados", "memoria_sessao"):
+        resumo[f"{coluna}_kb"] = (grupos[coluna].median() / 1024).round(1)
+    resumo["memoria_sessao_max_kb"] = (grupos["memoria_sessao"].max() / 1024).round(1)
+    return resumo.reset_index().rename(columns={"nome": "grade"})
@@ -0,0 +1,170 @@
+import re
+from pathlib import Path
+
+from sqlalchemy import (
+    BigInteger, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, Numeric, String, Table, Text, text,
+)
+
+# === ESQUEMA DO BANCO (PARA POSTGRES/SQLITE LOCAL) ===
+# Espelha as tabelas usadas pelo app no Supabase. Serve para criar bancos
+# locais de teste e de benchmark: python esquema.py sqlite:///local.db
+
+metadata = MetaData()
+
+pedidos = Table(
+    "pedidos", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("numero_pedido", String(20), nullable=False),
+    Column("data_emissao", DateTime),
+    Column("hospital", Text),
+    Column("endereco_entrega", Text),
+    Column("estado", Text),
+    Column("uf", String(2)),
+    Index("pedidos_numero_pedido_key", "numero_pedido", unique=True),
+)
+
+itens_pedido = Table(
+    "itens_pedido", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("id_pedido", Integer, ForeignKey("pedidos.id"), nullable=False, index=True),
+    Column("codigo_material", String(20)),
+    Column("descricao", Text),
+    Column("quantidade", Integer),
+    Column("valor_unitario", Numeric(12, 3)),
+    Column("data_entrega", DateTime),
+)
+
+status_tecido = Table(
+    "status_tecido", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("nome", Text, nullable=False, unique=True),
+)
+
+status_faturamento = Table(
+    "status_faturamento", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("nome", Text, nullable=False, unique=True),
+)
+
+logistica = Table(
+    "logistica", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("nome", Text, nullable=False, unique=True),
+)
+
+producao = Table(
+    "producao", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("id_item_pedido", Integer, ForeignKey("itens_pedido.id"), nullable=False, index=True),
+    Column("status_tecido_id", Integer, ForeignKey("status_tecido.id")),
+    Column("faturamento_id", Integer, ForeignKey("status_faturamento.id")),
+    Column("logistica_id", Integer, ForeignKey("logistica.id")),
+    Column("status_tecido", Text),
+    Column("faturamento", Text),
+    Column("logistica", Text),
+    Column("data_faturamento", Date),
+    Column("nota_fiscal", Text),
+    Column("ordem_fabricacao", Text),
+    Column("quantidade_op", Integer),
+    Column("consumo", Float),
+    Column("tecido", Text),
+    Column("data_entrega", Date),
+    Column("cor_prioridade", String(12)),
+    Column("versao", BigInteger, nullable=False, server_default="0"),  # ver sql/002_producao_leitura.sql
+)
+
+VALORES_REFERENCIA = {
+    "status_tecido": ["COMPRADO", "RECEBIDO", "CORTADO"],
+    "status_faturamento": ["EXPEDICAO", "FATURADO", "OK"],
+    "logistica": ["PALETE", "PAVÃO", "ENTREGUE"],
+}
+
+
+# === MODELO DE LEITURA (producao_leitura) E RESUMO DO PAINEL (producao_resumo_atual) ===
+# No Postgres são mantidos por gatilhos (sql/002_producao_leitura.sql e
+# sql/003_producao_resumo.sql, nesta ordem). No SQLite, usado só em testes e
+# benchmarks locais, são views com a mesma seleção (as views *_fonte, lidas
+# dos próprios arquivos SQL).
+PASTA_SQL = Path(__file__).resolve().parent / "sql"
+ARQUIVO_MODELO_LEITURA = PASTA_SQL / "002_producao_leitura.sql"
+ARQUIVO_RESUMO = PASTA_SQL / "003_producao_resumo.sql"
+
+# Semana de entrega (segunda-feira) no SQLite, no lugar do date_trunc do Postgres
+SEMANA_POSTGRES = "to_char(date_trunc('week', data_entrega), 'YYYY-MM-DD')"
+SEMANA_SQLITE = "date(data_entrega, '-6 days', 'weekday 1')"
+
+# Versão de linha no SQLite: um contador (MAX + 1, pelo índice) em vez do id da
+# transação. Há um só escritor por vez, então a ordem das versões é a ordem
+# das gravações e o feed parte da maior versão gravada + 1.
+SQL_VERSAO_SQLITE = (
+    "CREATE INDEX IF NOT EXISTS producao_versao_idx ON producao (versao)",
+    """CREATE TRIGGER IF NOT EXISTS producao_versao AFTER UPDATE ON producao
+       WHEN NEW.versao = OLD.versao
+       BEGIN
+           UPDATE producao SET versao = (SELECT MAX(versao) + 1 FROM producao) WHERE id = NEW.id;
+       END""",
+    "DROP VIEW IF EXISTS producao_feed",
+    "CREATE VIEW producao_feed AS SELECT COALESCE(MAX(versao), 0) + 1 AS desde FROM producao",
+)
+
+
+def _selecao_fonte(script, view):
+    return re.search(rf"CREATE OR REPLACE VIEW {view} AS\s*(.*?);", script, re.DOTALL).group(1)
+
+
+def criar_modelo_leitura(engine):
+    scripts = [arquivo.read_text(encoding="utf-8") for arquivo in (ARQUIVO_MODELO_LEITURA, ARQUIVO_RESUMO)]
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # no_parameters: o driver não interpreta os "%" do script
+            for script in scripts:
+                conn.execution_options(no_parameters=True).exec_driver_sql(script)
+        else:
+            leitura, resumo = scripts
+            colunas = {linha[1] for linha in conn.exec_driver_sql("PRAGMA table_info(producao)")}
+            if "versao" not in colunas:
+                conn.exec_driver_sql("ALTER TABLE producao ADD COLUMN versao BIGINT NOT NULL DEFAULT 0")
+            for comando in SQL_VERSAO_SQLITE:
+                conn.exec_driver_sql(comando)
+
+            # Views recriadas a cada vez: acompanham colunas novas das seleções
+            conn.exec_driver_sql("DROP VIEW IF EXISTS producao_resumo")  # nome antigo da view do resumo
+            views = {
+                "producao_leitura": _selecao_fonte(leitura, "producao_leitura_fonte"),
+                "producao_resumo_atual": _selecao_fonte(resumo, "producao_resumo_fonte").replace(SEMANA_POSTGRES, SEMANA_SQLITE),
+            }
+            for view, selecao in views.items():
+                conn.exec_driver_sql(f"DROP VIEW IF EXISTS {view}")
+                conn.exec_driver_sql(f"CREATE VIEW {view} AS {selecao}")
+
+
+def consolidar_resumo(engine):
+    # Dobra os deltas do resumo do painel no consolidado (producao_resumo_consolidar,
+    # em transação própria). Chamado pelo painel e ao fim dos gravadores em
+    # massa, para a tabela de deltas não crescer sem limite. No SQLite o
+    # resumo é uma view e não há o que dobrar.
+    if engine.dialect.name != "postgresql":
+        return 0
+    with engine.begin() as conn:
+        return conn.execute(text("SELECT producao_resumo_consolidar()")).scalar_one()
+
+
+def criar_esquema(engine):
+    # Cria as tabelas que faltam, preenche as tabelas de referência vazias e
+    # (re)cria o modelo de leitura
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        for nome, valores in VALORES_REFERENCIA.items():
+            tabela = metadata.tables[nome]
+            if conn.execute(tabela.select().limit(1)).first() is None:
+                conn.execute(tabela.insert(), [{"nome": valor} for valor in valores])
+    criar_modelo_leitura(engine)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from banco import conectar
+
+    criar_esquema(conectar(sys.argv[1] if len(sys.argv) > 1 else None))
+    print("Esquema criado.")
@@ -0,0 +1,138 @@
+import datetime
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+
+from diagnostico import medir
+
+# === EXPORTACAO EM BLOCOS (MEMORIA CONSTANTE) ===
+# A consulta é lida por um cursor no servidor (stream_results): o Postgres
+# entrega LINHAS_POR_BLOCO linhas por FETCH e cada bloco é gravado no arquivo
+# antes do seguinte ser buscado. A memória do processo não depende do total
+# de linhas, e cada FETCH é um comando curto (não esbarra no statement_timeout
+# do pooler); a transação fica ativa enquanto houver blocos a ler.
+# O arquivo vai para static/exportacoes (servido pelo próprio Streamlit com
+# server.enableStaticServing): o download sai do disco, sem passar pela
+# memória do script. Cada exportação tem uma pasta de nome aleatório e é
+# apagada depois de EXPORTACAO_HORAS.
+
+LINHAS_POR_BLOCO = int(os.getenv("EXPORTACAO_BLOCO", "10000"))
+HORAS_RETENCAO = float(os.getenv("EXPORTACAO_HORAS", "24"))
+PASTA_EXPORTACOES = Path(__file__).resolve().parent / "static" / "exportacoes"
+URL_EXPORTACOES = "app/static/exportacoes"
+FORMATOS = {"CSV": ".csv", "Parquet": ".parquet"}
+
+
+def ler_em_blocos(engine, sql, params=None, tamanho=LINHAS_POR_BLOCO):
+    # Gera um DataFrame por bloco; sem linhas, um único quadro vazio com as colunas
+    with engine.connect() as conn:
+        resultado = conn.execution_options(stream_results=True, yield_per=tamanho).execute(text(sql), params or {})
+        colunas = list(resultado.keys())
+        vazio = True
+        for linhas in resultado.partitions(tamanho):
+            vazio = False
+            yield pd.DataFrame(linhas, columns=colunas)
+        if vazio:
+            yield pd.DataFrame(columns=colunas)
+
+
+# === ESCRITORES ===
+class EscritorCsv:
+    # Separador ";" e vírgula decimal: abre direto no Excel em português
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "w", encoding="utf-8-sig", newline="")
+        self.cabecalho = True
+
+    def escrever(self, df):
+        df.to_csv(self.arquivo, index=False, header=self.cabecalho, sep=";", decimal=",")
+        self.cabecalho = False
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+class EscritorParquet:
+    # Um row group por bloco. O esquema vem do primeiro bloco; os seguintes são
+    # convertidos para ele (ex.: inteiros que viraram float num bloco com nulos)
+    def __init__(self, caminho):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa, self.pq = pa, pq
+        self.caminho = caminho
+        self.escritor = None
+
+    def _esquema(self, tabela):
+        pa = self.pa
+        campos = []
+        for campo in tabela.schema:
+            if pa.types.is_null(campo.type):
+                # Coluna só com nulos no primeiro bloco: o tipo é desconhecido, fica texto
+                campo = campo.with_type(pa.string())
+            elif pa.types.is_decimal(campo.type):
+                # A precisão é inferida dos valores do bloco; usa a máxima
+                campo = campo.with_type(pa.decimal128(38, campo.type.scale))
+            campos.append(campo)
+        return pa.schema(campos)
+
+    def escrever(self, df):
+        tabela = self.pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata()
+        if self.escritor is None:
+            self.escritor = self.pq.ParquetWriter(self.caminho, self._esquema(tabela))
+        self.escritor.write_table(tabela.cast(self.escritor.schema))
+
+    def fechar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+ESCRITORES = {"CSV": EscritorCsv, "Parquet": EscritorParquet}
+
+
+# === ARQUIVOS EXPORTADOS ===
+def limpar_antigas(horas=HORAS_RETENCAO):
+    if not PASTA_EXPORTACOES.exists():
+        return
+    limite = time.time() - horas * 3600
+    for pasta in PASTA_EXPORTACOES.iterdir():
+        if pasta.is_dir() and pasta.stat().st_mtime < limite:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+
+def exportar(engine, sql, params, formato, nome, ao_progredir=None, tamanho=LINHAS_POR_BLOCO):
+    # Grava o resultado da consulta em disco, bloco a bloco.
+    # ao_progredir(linhas_gravadas) é chamado depois de cada bloco.
+    # Devolve {"arquivo", "url", "linhas", "bytes"}.
+    limpar_antigas()
+    pasta = PASTA_EXPORTACOES / uuid.uuid4().hex
+    pasta.mkdir(parents=True)
+    arquivo = f"{nome}_{datetime.datetime.now():%Y%m%d_%H%M%S}{FORMATOS[formato]}"
+    caminho = pasta / arquivo
+
+    linhas = 0
+    with medir("exportacao", nome, formato=formato) as dados:
+        escritor = ESCRITORES[formato](caminho)
+        try:
+            for bloco in ler_em_blocos(engine, sql, params, tamanho):
+                escritor.escrever(bloco)
+                linhas += len(bloco)
+                if ao_progredir:
+                    ao_progredir(linhas)
+        except Exception:
+            escritor.fechar()
+            shutil.rmtree(pasta, ignore_errors=True)
+            raise
+        escritor.fechar()
+        dados["linhas"] = linhas
+
+    return {
+        "arquivo": arquivo,
+        "url": f"{URL_EXPORTACOES}/{pasta.name}/{arquivo}",
+        "linhas": linhas,
+        "bytes": caminho.stat().st_size,
+    }
@@ -0,0 +1,169 @@
+import copy
+import datetime
+import hashlib
+import os
+import pickle
+import re
+
+import fitz  # PyMuPDF
+
+from cache import CacheLRU
+from diagnostico import medir
+
+# === EXTRACAO DE DADOS DO PDF (PAGINA A PAGINA) ===
+# As páginas são lidas uma a uma e descartadas: o texto completo do documento
+# nunca fica em memória. O cabeçalho é procurado numa janela com as duas
+# últimas páginas (na prática, resolvido nas primeiras); os itens são casados
+# página a página, levando para a página seguinte só o trecho final ainda não
+# casado, para não perder itens quebrados entre páginas.
+
+PADROES_CABECALHO = {
+    "numero_pedido": re.compile(r"Pedido de Compra\s+Nº Pedido:\s*(\d+)"),
+    "data_emissao": re.compile(r"Data Emiss[ãa]o:\s*(\d{2}\.\d{2}\.\d{4})"),
+    "hospital": re.compile(r"Dados de Faturamento\n(.*?)\n"),
+    "endereco": re.compile(r"HAM - HOSPITAL ILHA DO LEITE\n(.*?)\nRECIFE", re.DOTALL),
+    "uf": re.compile(r"RECIFE\s*-\s*(\w{2})"),
+    "cidade": re.compile(r"Endereço de Entrega.*?\n(.*?)\n(.*?)\n", re.DOTALL),
+}
+
+PADRAO_ITEM = re.compile(r"\d{5}\s+(\d{2}\.\d{2}\.\d{4})\s+(\d+)\s+(.*?)\s+(\d+,\d{3})\s+UD\s+(\d+,\d{3})")
+
+# Trecho do fim de cada página que só é casado junto com a página seguinte
+# (bem maior que um item, que ocupa poucas linhas)
+MARGEM_ITEM = 2000
+
+
+def abrir_pdf(file):
+    # Aceita caminho, bytes ou o arquivo do st.file_uploader (qualquer objeto com .read())
+    if isinstance(file, (str, os.PathLike)):
+        return fitz.open(file)
+    conteudo = file if isinstance(file, (bytes, bytearray)) else file.read()
+    return fitz.open(stream=conteudo, filetype="pdf")
+
+
+def paginas_texto(doc):
+    for numero in range(doc.page_count):
+        yield doc.load_page(numero).get_text("text")
+
+
+def _converter_item(item):
+    return {
+        "codigo_material": item[1],
+        "descricao": item[2].strip(),
+        "quantidade": int(float(item[3].replace(".", "").replace(",", "."))),
+        "valor_unitario": float(item[4].replace(",", ".")),
+        "data_entrega": datetime.datetime.strptime(item[0], "%d.%m.%Y")
+    }
+
+
+class _LeitorCabecalho:
+    def __init__(self):
+        self.achados = {}
+        self.paginas = []
+
+    def completo(self):
+        return len(self.achados) == len(PADROES_CABECALHO)
+
+    def alimentar(self, texto):
+        if self.completo():
+            return
+        self.paginas = self.paginas[-1:] + [texto]
+        janela = "\n".join(self.paginas)
+        for campo, padrao in PADROES_CABECALHO.items():
+            if campo not in self.achados:
+                achado = padrao.search(janela)
+                if achado:
+                    self.achados[campo] = achado
+
+    def pedido(self):
+        achados = self.achados
+        numero_pedido = achados.get("numero_pedido")
+        data_emissao = achados.get("data_emissao")
+        hospital = achados.get("hospital")
+        endereco = achados.get("endereco")
+        uf_linha = achados.get("uf")
+        cidade_linha = achados.get("cidade")
+
+        # Captura cidade e UF
+        uf = uf_linha.group(1) if uf_linha else None
+        cidade = cidade_linha.group(2).split("-")[0].strip() if cidade_linha else None
+
+        return {
+            "numero_pedido": numero_pedido.group(1) if numero_pedido else None,
+            "data_emissao": datetime.datetime.strptime(data_emissao.group(1), "%d.%m.%Y") if data_emissao else None,
+            "hospital": hospital.group(1).strip() if hospital else None,
+            "endereco_entrega": endereco.group(1).replace("\n", " ").strip() if endereco else None,
+            "estado": cidade,
+            "uf": uf
+        }
+
+
+def _itens_do_trecho(trecho, final):
+    # Devolve (itens casados, sobra a juntar com a próxima página)
+    itens, fim = [], 0
+    corte = len(trecho) - MARGEM_ITEM
+    for achado in PADRAO_ITEM.finditer(trecho):
+        if not final and achado.end() > corte:
+            corte = min(corte, achado.start())
+            break
+        itens.append(achado.groups())
+        fim = achado.end()
+    return itens, ("" if final else trecho[max(fim, corte):])
+
+
+def iterar_pdf(textos, cabecalho=None):
+    # Gera os itens (dicts) a partir de um iterável de textos de página
+    sobra = None
+    for texto in textos:
+        if cabecalho is not None:
+            cabecalho.alimentar(texto)
+        trecho = texto if sobra is None else sobra + "\n" + texto
+        itens, sobra = _itens_do_trecho(trecho, final=False)
+        for item in itens:
+            yield _converter_item(item)
+    if sobra:
+        for item in _itens_do_trecho(sobra, final=True)[0]:
+            yield _converter_item(item)
+
+
+def iterar_itens_pdf(file):
+    # Itens do pedido sob demanda, sem montar a lista inteira
+    with abrir_pdf(file) as doc:
+        yield from iterar_pdf(paginas_texto(doc))
+
+
+def extrair_dados_pdf(file):
+    with medir("pdf", "extrair_dados_pdf") as span, abrir_pdf(file) as doc:
+        cabecalho = _LeitorCabecalho()
+        lista_itens = list(iterar_pdf(paginas_texto(doc), cabecalho))
+        span.update(paginas=doc.page_count, itens=len(lista_itens))
+    return cabecalho.pedido(), lista_itens
+
+
+# === CACHE DE PDFS JA LIDOS (POR HASH DO CONTEUDO) ===
+# Cada rerun da página de Upload chamaria extrair_dados_pdf de novo; com o
+# cache o mesmo conteúdo é lido uma vez por processo, em qualquer sessão.
+PDFS = CacheLRU(
+    max_itens=int(os.getenv("CACHE_PDF_ITENS", "512")),
+    ttl=None,
+    max_bytes=int(os.getenv("CACHE_PDF_MB", "64")) * 1024 * 1024,
+)
+
+
+def hash_conteudo(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def extrair_dados_pdf_cache(conteudo, chave=None):
+    chave = chave or hash_conteudo(conteudo)
+    resultado = PDFS.obter(chave)
+    if resultado is None:
+        resultado = extrair_dados_pdf(conteudo)
+        guardar_extracao(chave, resultado)
+    # Cópia: quem chama pode alterar os dicionários sem afetar o cache
+    return copy.deepcopy(resultado)
+
+
+def guardar_extracao(chave, resultado):
+    # O tamanho contabilizado é o do resultado serializado, não o do PDF
+    PDFS.guardar(chave, resultado, tamanho=len(pickle.dumps(resultado)))
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from persistencia import atualizar_em_lote
+
+# === SALVAMENTO POR DIFERENCA DA GRADE DE ACOMPANHAMENTO ===
+# Compara o quadro carregado com o quadro editado no AgGrid (vetorizado, por
+# coluna) e grava só as linhas alteradas, e nelas só as colunas alteradas.
+# Concorrência otimista pela versão de linha (producao.versao): uma linha que
+# outro operador gravou depois da leitura só é sobrescrita se as colunas
+# editadas aqui continuam como foram lidas; senão vira conflito e não é gravada.
+
+COLUNAS_EDITAVEIS = [
+    "status_tecido", "faturamento", "logistica", "nota_fiscal",
+    "ordem_fabricacao", "quantidade_op", "consumo", "tecido",
+]
+
+# Tipos SQL das colunas editáveis, para o UPDATE em lote (ver persistencia.atualizar_em_lote)
+TIPOS_EDITAVEIS = {"quantidade_op": "INTEGER", "consumo": "FLOAT"}
+
+
+def preparar_para_grade(df, colunas=COLUNAS_EDITAVEIS):
+    # Quadro enviado ao AgGrid. O st_aggrid converte o retorno para o dtype
+    # enviado (num float, com errors="coerce"): um "1,5" digitado viraria NaN
+    # antes de calcular_diferencas ver o texto. As colunas numéricas editáveis
+    # vão como objeto e voltam como foram digitadas.
+    df = df.copy()
+    for coluna in colunas:
+        if coluna in df.columns and pd.api.types.is_numeric_dtype(df[coluna]):
+            df[coluna] = df[coluna].astype(object).where(df[coluna].notna(), None)
+    return df
+
+
+def _iguais(original, editado):
+    # None/NaN/"" são equivalentes: o AgGrid devolve células vazias de formas diferentes
+    if pd.api.types.is_numeric_dtype(original):
+        return ((original == editado) | (original.isna() & editado.isna())).fillna(False)
+    return original.fillna("").astype(str).values == editado.fillna("").astype(str).values
+
+
+def _numero(serie, inteiro=False):
+    # Converte o texto digitado na grade; aceita vírgula decimal ("1,5").
+    # Devolve (valores, máscara de inválidos): inválido é a célula preenchida
+    # que não é número (ou não é inteiro, nas colunas inteiras)
+    texto = serie.astype(object).map(
+        lambda v: (v.strip() if "." in v else v.strip().replace(",", ".")) if isinstance(v, str) else v
+    )
+    valores = pd.to_numeric(texto, errors="coerce")
+    preenchidas = texto.notna() & (texto.astype(str) != "")
+    invalidas = preenchidas & valores.isna()
+    if inteiro:
+        invalidas |= valores.notna() & (valores != valores.round())
+        valores = valores.where(~invalidas).round().astype("Int64")
+    return valores, invalidas
+
+
+def calcular_diferencas(original, editado, colunas=COLUNAS_EDITAVEIS, chave="id"):
+    # Devolve um quadro booleano (linhas alteradas x colunas), o quadro editado
+    # alinhado e as células inválidas [{id, coluna, valor}]. Linhas com célula
+    # inválida ficam de fora: não são gravadas (nem com NULL no lugar do valor)
+    original = original.set_index(chave)
+    editado = editado.astype({chave: original.index.dtype}).set_index(chave)
+    editado = editado.loc[editado.index.intersection(original.index)]
+    original = original.loc[editado.index]
+
+    # O grid pode devolver números como texto: volta ao tipo da coluna carregada.
+    # Colunas category são comparadas como texto (o valor editado pode não
+    # estar entre as categorias carregadas).
+    digitado = editado
+    editado = editado.copy()
+    invalidas = pd.DataFrame(False, index=editado.index, columns=colunas)
+    for coluna in colunas:
+        if isinstance(original[coluna].dtype, pd.CategoricalDtype):
+            original[coluna] = original[coluna].astype(object)
+            editado[coluna] = editado[coluna].astype(object)
+        elif pd.api.types.is_numeric_dtype(original[coluna]):
+            inteiro = pd.api.types.is_integer_dtype(original[coluna])
+            editado[coluna], invalidas[coluna] = _numero(editado[coluna], inteiro)
+
+    mascara = pd.DataFrame(
+        {coluna: ~np.asarray(_iguais(original[coluna], editado[coluna])) for coluna in colunas},
+        index=editado.index,
+    )
+    rejeitadas = [
+        {chave: _valor(id_linha), "coluna": coluna, "valor": digitado.at[id_linha, coluna]}
+        for id_linha, linha in invalidas[invalidas.any(axis=1)].iterrows()
+        for coluna in linha.index[linha]
+    ]
+    linhas = mascara.any(axis=1) & ~invalidas.any(axis=1)
+    return mascara[linhas], editado.loc[linhas, colunas], rejeitadas
+
+
+def _valor(valor):
+    if valor is None or valor is pd.NA or (not isinstance(valor, str) and pd.isna(valor)):
+        return None
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+def montar_update(colunas=COLUNAS_EDITAVEIS, tabela="producao", chave="id"):
+    # Devolve (tipos, atribuições) do UPDATE em lote: cada coluna só é trocada
+    # quando o indicador "alterar_<coluna>" da linha está ligado. A versão lida
+    # (travada em verificar_conflitos) garante que nada mudou entre a
+    # conferência e o UPDATE.
+    tipos = {chave: "INTEGER", "versao": "BIGINT"}
+    for coluna in colunas:
+        tipos[f"alterar_{coluna}"] = "INTEGER"
+        tipos[coluna] = TIPOS_EDITAVEIS.get(coluna, "TEXT")
+    atribuicoes = ",\n".join(
+        f"{coluna} = CASE WHEN v.alterar_{coluna} = 1 THEN v.{coluna} ELSE {tabela}.{coluna} END"
+        for coluna in colunas
+    )
+    return tipos, atribuicoes
+
+
+def verificar_conflitos(conn, original, mascara, tabela="producao", leitura="producao_leitura", chave="id"):
+    # Trava as linhas alteradas e compara com o estado atual no banco.
+    # Devolve {id: versão atual} das linhas que podem ser gravadas e a lista de
+    # conflitos [{id, colunas}] (colunas editadas aqui e mudadas por outro).
+    ids = [_valor(i) for i in mascara.index]
+    trava = " FOR UPDATE" if conn.dialect.name == "postgresql" else ""
+    consulta = text(f"SELECT {chave}, versao FROM {tabela} WHERE {chave} IN :ids{trava}")
+    atuais = dict(conn.execute(consulta.bindparams(bindparam("ids", expanding=True)), {"ids": ids}).all())
+
+    lidas = original.set_index(chave)["versao"]
+    mudaram = [i for i in ids if i in atuais and atuais[i] != _valor(lidas.loc[i])]
+    conflitos = [{chave: i, "colunas": "(linha excluída)"} for i in ids if i not in atuais]
+    if mudaram:
+        # Valores atuais já resolvidos (status por texto ou por id), como a grade os exibe
+        colunas = list(mascara.columns)
+        consulta = text(f"SELECT {chave}, {', '.join(colunas)} FROM {leitura} WHERE {chave} IN :ids")
+        no_banco = pd.read_sql(consulta.bindparams(bindparam("ids", expanding=True)), conn, params={"ids": mudaram})
+        no_banco = no_banco.astype({chave: original[chave].dtype}).set_index(chave)
+        carregado = original.set_index(chave).loc[no_banco.index, colunas]
+        for coluna in colunas:
+            if isinstance(carregado[coluna].dtype, pd.CategoricalDtype):
+                carregado[coluna] = carregado[coluna].astype(object)
+        # Coluna mudada no banco e editada aqui: conflito
+        mexidas = pd.DataFrame(
+            {coluna: ~np.asarray(_iguais(carregado[coluna], no_banco[coluna])) for coluna in colunas},
+            index=no_banco.index,
+        ) & mascara.loc[no_banco.index]
+        for id_linha, linha in mexidas.iterrows():
+            if linha.any():
+                conflitos.append({chave: _valor(id_linha), "colunas": ", ".join(linha.index[linha])})
+
+    em_conflito = {c[chave] for c in conflitos}
+    return {i: atuais[i] for i in ids if i not in em_conflito}, conflitos
+
+
+def salvar_diferencas(conn, original, editado, colunas=COLUNAS_EDITAVEIS, tabela="producao", chave="id"):
+    # Devolve (linhas gravadas, conflitos, células inválidas); ver
+    # verificar_conflitos e calcular_diferencas
+    mascara, valores, invalidas = calcular_diferencas(original, editado, colunas, chave)
+    if mascara.empty:
+        return 0, [], invalidas
+    versoes, conflitos = verificar_conflitos(conn, original, mascara, tabela, chave=chave)
+
+    registros = []
+    for (id_linha, alterar), (_, linha) in zip(mascara.iterrows(), valores.iterrows()):
+        if _valor(id_linha) not in versoes:
+            continue
+        registro = {chave: _valor(id_linha), "versao": versoes[_valor(id_linha)]}
+        for coluna in colunas:
+            registro[f"alterar_{coluna}"] = int(alterar[coluna])
+            registro[coluna] = _valor(linha[coluna]) if alterar[coluna] else None
+        registros.append(registro)
+
+    if registros:
+        tipos, atribuicoes = montar_update(colunas, tabela, chave)
+        atualizar_em_lote(conn, tabela, registros, tipos, atribuicoes, f"{tabela}.versao = v.versao", chave)
+    return len(registros), conflitos, invalidas
+
+
+# === FEED DE ALTERACOES (ACOMPANHAMENTO) ===
+# A página guarda o quadro carregado e o "desde" lido junto com ele (view
+# producao_feed). Atualizar busca só as linhas da página com versao >= desde,
+# pelo índice de versao: o custo acompanha o volume de alterações, não o
+# tamanho da tabela.
+def alteracoes_desde(conn, consulta, desde, ids):
+    # Devolve (linhas alteradas, novo "desde"). O novo ponto de partida é lido
+    # antes das linhas: o que for gravado entre as duas leituras volta na próxima.
+    novo_desde = conn.execute(text("SELECT desde FROM producao_feed")).scalar_one()
+    if desde is None or not ids:
+        return pd.DataFrame(), novo_desde
+    sql = text(f"SELECT {consulta.selecao} FROM {consulta.origem} WHERE versao >= :desde AND {consulta.chave} IN :ids")
+    alteradas = pd.read_sql(
+        sql.bindparams(bindparam("ids", expanding=True)), conn, params={"desde": desde, "ids": [_valor(i) for i in ids]}
+    )
+    return alteradas, novo_desde
+
+
+def mesclar(df, alteradas, chave="id"):
+    # Troca no quadro as linhas que vieram do feed, mantendo ordem e colunas
+    if alteradas.empty:
+        return df
+    alteradas = alteradas.astype({chave: df[chave].dtype})
+    manter = df[~df[chave].isin(alteradas[chave])]
+    combinado = pd.concat([manter, alteradas[df.columns]], ignore_index=True)
+    return combinado.set_index(chave).loc[df[chave]].reset_index()
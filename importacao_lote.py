@@ -0,0 +1,132 @@
+import copy
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from diagnostico import medir
+from extracao_pdf import PDFS, extrair_dados_pdf, guardar_extracao, hash_conteudo
+
+# === IMPORTACAO DE PDFs EM LOTE ===
+# Os PDFs são lidos em paralelo em um pool de processos (um por núcleo).
+# O contexto "spawn" evita fazer fork do servidor do Streamlit, que tem threads.
+
+STATUS_OK = "OK"
+STATUS_DUPLICADO_LOTE = "DUPLICADO NO LOTE"
+STATUS_JA_IMPORTADO = "JÁ IMPORTADO"
+STATUS_ERRO = "ERRO"
+
+
+def expandir_arquivos(arquivos):
+    # Recebe pares (nome, bytes); ZIPs são abertos e seus PDFs entram no lote
+    for nome, conteudo in arquivos:
+        if nome.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(conteudo)) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                        yield f"{nome}/{info.filename}", zf.read(info)
+        else:
+            yield nome, conteudo
+
+
+def _resultado(nome, pedido, itens):
+    # Regras de aceitação de uma extração: valem para a leitura nova e para a
+    # que vem do cache (que também é preenchido pela leitura de um PDF avulso)
+    if not pedido["numero_pedido"]:
+        raise ValueError("Número do pedido não encontrado no PDF")
+    return {"arquivo": nome, "pedido": pedido, "itens": itens, "erro": None}
+
+
+def _falha(nome, erro):
+    return {"arquivo": nome, "pedido": None, "itens": [], "erro": f"{type(erro).__name__}: {erro}"}
+
+
+def extrair_arquivo(nome, conteudo):
+    # Executado no processo filho: nunca propaga exceção, devolve o erro como texto
+    try:
+        return _resultado(nome, *extrair_dados_pdf(conteudo))
+    except Exception as e:
+        return _falha(nome, e)
+
+
+def extrair_lote(arquivos, max_workers=None, ao_progredir=None):
+    # ao_progredir(concluidos, total, resultado) é chamado a cada arquivo finalizado
+    arquivos = list(arquivos)
+    total = len(arquivos)
+    if not total:
+        return []
+
+    resultados = [None] * total
+    concluidos = 0
+
+    # PDFs já lidos (mesmo conteúdo, em qualquer sessão) saem do cache sem ir ao pool
+    pendentes = []
+    for i, (nome, conteudo) in enumerate(arquivos):
+        chave = hash_conteudo(conteudo)
+        extraido = PDFS.obter(chave)
+        if extraido is None:
+            pendentes.append((i, chave, nome, conteudo))
+            continue
+        try:
+            resultados[i] = _resultado(nome, *copy.deepcopy(extraido))
+        except Exception as e:
+            resultados[i] = _falha(nome, e)
+        concluidos += 1
+        if ao_progredir:
+            ao_progredir(concluidos, total, resultados[i])
+    if not pendentes:
+        return resultados
+
+    contexto = multiprocessing.get_context("spawn")
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(pendentes)))
+    with medir("pdf", "extrair_lote", arquivos=len(pendentes), workers=max_workers), \
+            ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto) as pool:
+        futuros = {pool.submit(extrair_arquivo, nome, conteudo): (i, chave) for i, chave, nome, conteudo in pendentes}
+        for futuro in as_completed(futuros):
+            i, chave = futuros[futuro]
+            resultado = futuro.result()
+            if not resultado["erro"]:
+                guardar_extracao(chave, copy.deepcopy((resultado["pedido"], resultado["itens"])))
+            # Mantém a ordem de envio na prévia
+            resultados[i] = resultado
+            concluidos += 1
+            if ao_progredir:
+                ao_progredir(concluidos, total, resultado)
+    return resultados
+
+
+def classificar_lote(resultados, ja_importados=()):
+    # Marca falhas, números repetidos dentro do lote e pedidos já existentes no banco
+    ja_importados = {str(n) for n in ja_importados}
+    vistos = set()
+    for resultado in resultados:
+        numero = resultado["pedido"]["numero_pedido"] if resultado["pedido"] else None
+        if resultado["erro"]:
+            resultado["status"] = STATUS_ERRO
+        elif numero in ja_importados:
+            resultado["status"] = STATUS_JA_IMPORTADO
+        elif numero in vistos:
+            resultado["status"] = STATUS_DUPLICADO_LOTE
+        else:
+            resultado["status"] = STATUS_OK
+            vistos.add(numero)
+    return resultados
+
+
+def resumo_lote(resultados):
+    return pd.DataFrame([{
+        "arquivo": r["arquivo"],
+        "numero_pedido": r["pedido"]["numero_pedido"] if r["pedido"] else None,
+        "hospital": r["pedido"]["hospital"] if r["pedido"] else None,
+        "itens": len(r["itens"]),
+        "valor_total": sum(i["quantidade"] * i["valor_unitario"] for i in r["itens"]),
+        "status": r.get("status"),
+        "erro": r["erro"],
+    } for r in resultados])
+
+
+def aceitos(resultados):
+    return [(r["pedido"], r["itens"]) for r in resultados if r.get("status") == STATUS_OK]
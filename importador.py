@@ -0,0 +1,220 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from banco import conectar
+from esquema import consolidar_resumo, criar_esquema
+from extracao_pdf import hash_conteudo
+from importacao_lote import STATUS_ERRO, STATUS_OK, classificar_lote, extrair_lote
+from persistencia import pedidos_existentes, salvar_pedidos
+
+# === IMPORTADOR SEM INTERFACE (LINHA DE COMANDO / PASTA OBSERVADA) ===
+# Importa os PDFs de uma pasta com a mesma extração e a mesma gravação da
+# página de Upload, sem passar pelo Streamlit. Exemplos:
+#   python importador.py /dados/pedidos
+#   python importador.py /dados/entrada --observar --intervalo 10 --resumo resumo.json
+#   python importador.py pdfs --database-url sqlite:///local.db --criar-esquema
+
+log = logging.getLogger("importador")
+
+MAX_ERROS_VARREDURA = 50  # erros mais recentes mantidos no resumo
+# Arquivos mais recentes listados em importados/duplicados/falhas; "totais"
+# conta todos. O modo observado roda por dias: as listas não podem crescer sem
+# limite (o checkpoint guarda o status de cada arquivo)
+MAX_ARQUIVOS_RESUMO = 1000
+
+
+class Checkpoint:
+    # Arquivo JSON com o hash de cada PDF já tratado: reexecuções e o modo
+    # observado não reprocessam o mesmo conteúdo. Guarda também tamanho e
+    # mtime de cada arquivo já visto: na varredura seguinte ele é pulado sem
+    # ser lido nem ter o hash calculado, então o custo de uma varredura
+    # acompanha os arquivos novos, não o histórico da pasta.
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        dados = json.loads(self.caminho.read_text(encoding="utf-8")) if self.caminho.exists() else {}
+        if "conteudos" not in dados:
+            dados = {"conteudos": dados, "arquivos": {}}  # checkpoint antigo: só os hashes
+        self.registros = dados["conteudos"]
+        self.arquivos = dados["arquivos"]  # caminho -> [tamanho, mtime_ns, hash]
+
+    def __contains__(self, chave):
+        return chave in self.registros
+
+    def visto(self, caminho, estado):
+        assinatura = self.arquivos.get(str(caminho))
+        return assinatura is not None and assinatura[:2] == [estado.st_size, estado.st_mtime_ns]
+
+    def marcar_visto(self, caminho, estado, chave):
+        self.arquivos[str(caminho)] = [estado.st_size, estado.st_mtime_ns, chave]
+
+    def esquecer_ausentes(self, caminhos):
+        # Arquivos removidos ou movidos da pasta saem do checkpoint
+        presentes = {str(c) for c in caminhos}
+        ausentes = [c for c in self.arquivos if c not in presentes]
+        for caminho in ausentes:
+            del self.arquivos[caminho]
+        return len(ausentes)
+
+    def registrar(self, chave, arquivo, status, numero_pedido=None):
+        self.registros[chave] = {
+            "arquivo": arquivo,
+            "status": status,
+            "numero_pedido": numero_pedido,
+            "quando": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def salvar(self):
+        # Grava num temporário e troca: um kill no meio não corrompe o checkpoint
+        temporario = self.caminho.with_suffix(".tmp")
+        dados = {"conteudos": self.registros, "arquivos": self.arquivos}
+        temporario.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temporario, self.caminho)
+
+
+def novo_resumo():
+    return {
+        "inicio": datetime.datetime.now().isoformat(timespec="seconds"),
+        "fim": None,
+        "totais": {"importados": 0, "duplicados": 0, "falhas": 0},
+        "importados": [],
+        "duplicados": [],
+        "falhas": [],
+        "ja_processados": 0,
+        "erros_varredura": [],
+    }
+
+
+def _anotar(resumo, lista, entrada):
+    resumo["totais"][lista] += 1
+    resumo[lista].append(entrada)
+    del resumo[lista][:-MAX_ARQUIVOS_RESUMO]
+
+
+def listar_pdfs(pasta, idade_minima=0):
+    # idade_minima evita pegar arquivos que ainda estão sendo copiados para a pasta
+    agora = time.time()
+    return sorted(
+        p for p in Path(pasta).iterdir()
+        if p.is_file() and p.suffix.lower() == ".pdf" and agora - p.stat().st_mtime >= idade_minima
+    )
+
+
+def importar_arquivos(engine, caminhos, checkpoint, resumo, workers=None, lote=50):
+    # Lê e grava em blocos de "lote" arquivos: memória limitada e checkpoint frequente
+    alterado = checkpoint.esquecer_ausentes(caminhos) > 0
+    pendentes = []
+    for caminho in caminhos:
+        estado = caminho.stat()
+        if checkpoint.visto(caminho, estado):
+            resumo["ja_processados"] += 1
+            continue
+        conteudo = caminho.read_bytes()
+        chave = hash_conteudo(conteudo)
+        if chave in checkpoint:
+            # Mesmo conteúdo com outro nome (ou arquivo regravado igual)
+            checkpoint.marcar_visto(caminho, estado, chave)
+            resumo["ja_processados"] += 1
+            alterado = True
+            continue
+        pendentes.append((chave, caminho, estado, conteudo))
+
+    for inicio in range(0, len(pendentes), lote):
+        bloco = pendentes[inicio:inicio + lote]
+        resultados = extrair_lote([(str(caminho), conteudo) for _, caminho, _, conteudo in bloco], max_workers=workers)
+
+        numeros = [r["pedido"]["numero_pedido"] for r in resultados if r["pedido"]]
+        with engine.connect() as conn:
+            classificar_lote(resultados, pedidos_existentes(conn, numeros))
+
+        aceitos = [r for r in resultados if r["status"] == STATUS_OK]
+        with engine.begin() as conn:
+            salvos, _ = salvar_pedidos(conn, [(r["pedido"], r["itens"]) for r in aceitos])
+
+        for (chave, caminho, estado, _), r in zip(bloco, resultados):
+            nome = str(caminho)
+            numero = r["pedido"]["numero_pedido"] if r["pedido"] else None
+            if r["status"] == STATUS_ERRO:
+                _anotar(resumo, "falhas", {"arquivo": nome, "erro": r["erro"]})
+                status = "falha"
+            elif r["status"] == STATUS_OK and numero in salvos:
+                _anotar(resumo, "importados", {"arquivo": nome, "numero_pedido": numero, "itens": len(r["itens"])})
+                status = "importado"
+            else:
+                _anotar(resumo, "duplicados", {"arquivo": nome, "numero_pedido": numero})
+                status = "duplicado"
+            checkpoint.registrar(chave, nome, status, numero)
+            checkpoint.marcar_visto(caminho, estado, chave)
+        checkpoint.salvar()
+        log.info("%d/%d arquivo(s) tratados", min(inicio + lote, len(pendentes)), len(pendentes))
+    if alterado and not pendentes:
+        checkpoint.salvar()  # só arquivos marcados como vistos ou esquecidos
+    return resumo
+
+
+def gravar_resumo(resumo, destino):
+    resumo["fim"] = datetime.datetime.now().isoformat(timespec="seconds")
+    texto = json.dumps(resumo, ensure_ascii=False, indent=2)
+    if destino:
+        Path(destino).write_text(texto, encoding="utf-8")
+    else:
+        print(texto)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa PDFs de Pedido de Compra de uma pasta.")
+    parser.add_argument("pasta", help="pasta com os PDFs")
+    parser.add_argument("--observar", action="store_true", help="continua observando a pasta")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="segundos entre varreduras no modo observado")
+    parser.add_argument("--workers", type=int, default=None, help="processos de leitura (padrão: núcleos)")
+    parser.add_argument("--lote", type=int, default=50, help="arquivos por bloco de leitura/gravação")
+    parser.add_argument("--checkpoint", default=None, help="arquivo de checkpoint (padrão: <pasta>/.importador.json)")
+    parser.add_argument("--resumo", default=None, help="arquivo JSON de resumo (padrão: saída padrão)")
+    parser.add_argument("--database-url", default=None, help="URL SQLAlchemy (padrão: DATABASE_URL ou Supabase)")
+    parser.add_argument("--criar-esquema", action="store_true", help="cria as tabelas que faltam (banco local)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    engine = conectar(args.database_url)
+    if args.criar_esquema:
+        criar_esquema(engine)
+
+    checkpoint = Checkpoint(args.checkpoint or Path(args.pasta) / ".importador.json")
+    resumo = novo_resumo()
+    try:
+        while True:
+            # Uma falha da varredura (banco ou pooler fora do ar, erro de disco)
+            # vai para o resumo; no modo observado a próxima varredura tenta de
+            # novo. Os blocos já gravados estão no checkpoint e não se repetem.
+            try:
+                caminhos = listar_pdfs(args.pasta, idade_minima=2 if args.observar else 0)
+                importar_arquivos(engine, caminhos, checkpoint, resumo, args.workers, args.lote)
+                consolidar_resumo(engine)
+            except Exception as e:
+                log.exception("Falha na varredura de %s", args.pasta)
+                resumo["erros_varredura"].append({
+                    "quando": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "erro": f"{type(e).__name__}: {e}",
+                })
+                del resumo["erros_varredura"][:-MAX_ERROS_VARREDURA]
+            if not args.observar:
+                break
+            if args.resumo:
+                try:
+                    gravar_resumo(resumo, args.resumo)
+                except OSError:
+                    log.exception("Falha ao gravar o resumo em %s", args.resumo)
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        log.info("Interrompido.")
+    gravar_resumo(resumo, args.resumo)
+    return 1 if resumo["totais"]["falhas"] or resumo["erros_varredura"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
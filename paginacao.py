@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+
+from cache import ler_sql
+from quadros import compactar
+
+# === PAGINACAO, FILTRO E ORDENACAO NO SERVIDOR ===
+# Só a página visível é buscada. A paginação é por "keyset": a página seguinte
+# começa depois do par (coluna de ordenação, id) da última linha da anterior,
+# então o custo não cresce com o número da página (sem OFFSET).
+
+
+def _escapar_like(texto):
+    # "%", "_" e "\" digitados no filtro valem como texto, não como curinga
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass
+class ConsultaPaginada:
+    selecao: str                      # lista do SELECT
+    origem: str                       # FROM ... JOIN ...
+    chave: str                        # expressão da chave única (ex.: "pr.id")
+    colunas: dict                     # nome exibido -> expressão SQL (filtro/ordenação)
+    tabelas: tuple = ()               # tabelas lidas, para invalidação do cache
+    tabela_estimativa: str = None     # tabela usada na estimativa rápida de total
+    ordem_padrao: tuple = (None, False)
+    categoricas: tuple = ()           # colunas de status: category no quadro da página
+    sem_compactar: tuple = ()         # colunas mantidas no tipo lido (ex.: numéricas editáveis)
+
+    def _filtros(self, filtros):
+        condicoes, params = [], {}
+        for i, (nome, valor) in enumerate((filtros or {}).items()):
+            if valor in (None, "") or nome not in self.colunas:
+                continue
+            # ESCAPE explícito: o SQLite não tem caractere de escape padrão no LIKE
+            condicoes.append(f"LOWER(CAST({self.colunas[nome]} AS VARCHAR)) LIKE :filtro_{i} ESCAPE '\\'")
+            params[f"filtro_{i}"] = f"%{_escapar_like(str(valor).strip().lower())}%"
+        return condicoes, params
+
+    def _ordem(self, ordem):
+        nome, crescente = ordem if ordem and ordem[0] else self.ordem_padrao
+        expressao = self.colunas.get(nome, self.chave) if nome else self.chave
+        return expressao, bool(crescente)
+
+    def sql_pagina(self, filtros=None, ordem=None, cursor=None, tamanho=100):
+        condicoes, params = self._filtros(filtros)
+        expressao, crescente = self._ordem(ordem)
+        direcao = "ASC" if crescente else "DESC"
+        comparador = ">" if crescente else "<"
+
+        # Nulos ficam sempre no fim; o cursor é (valor de ordenação, chave)
+        if cursor is not None:
+            valor, chave = cursor
+            if valor is None:
+                condicoes.append(f"({expressao} IS NULL AND {self.chave} {comparador} :cursor_chave)")
+            else:
+                condicoes.append(
+                    f"({expressao} {comparador} :cursor_valor"
+                    f" OR ({expressao} = :cursor_valor AND {self.chave} {comparador} :cursor_chave)"
+                    f" OR {expressao} IS NULL)"
+                )
+                params["cursor_valor"] = valor
+            params["cursor_chave"] = chave
+
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        params["limite"] = tamanho + 1
+        sql = f"""
+            SELECT {self.selecao}, {expressao} AS _ordem, {self.chave} AS _chave
+            FROM {self.origem}
+            {where}
+            ORDER BY {expressao} {direcao} NULLS LAST, {self.chave} {direcao}
+            LIMIT :limite
+        """
+        return sql, params
+
+    def sql_completo(self, filtros=None, ordem=None):
+        # Todas as linhas filtradas, na ordem da grade (exportação)
+        condicoes, params = self._filtros(filtros)
+        expressao, crescente = self._ordem(ordem)
+        direcao = "ASC" if crescente else "DESC"
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        sql = f"""
+            SELECT {self.selecao}
+            FROM {self.origem}
+            {where}
+            ORDER BY {expressao} {direcao} NULLS LAST, {self.chave} {direcao}
+        """
+        return sql, params
+
+    def pagina(self, engine, filtros=None, ordem=None, cursor=None, tamanho=100):
+        # Devolve (quadro da página, cursor da próxima página ou None)
+        sql, params = self.sql_pagina(filtros, ordem, cursor, tamanho)
+        df = ler_sql(engine, sql, self.tabelas, params, converter=self.compactar)
+        proximo = None
+        if len(df) > tamanho:
+            df = df.iloc[:tamanho]
+            ultima = df.iloc[-1]
+            proximo = (_escalar(ultima["_ordem"]), _escalar(ultima["_chave"]))
+        return df.drop(columns=["_ordem", "_chave"]), proximo
+
+    def compactar(self, df):
+        # O cursor (_ordem, _chave) fica intacto: seus valores voltam ao WHERE
+        return compactar(df, self.categoricas, preservar=("_ordem", "_chave", *self.sem_compactar))
+
+    def total(self, engine, filtros=None):
+        # Sem filtro, no Postgres, usa a estimativa do catálogo (instantânea)
+        condicoes, params = self._filtros(filtros)
+        if not condicoes and self.tabela_estimativa and engine.dialect.name == "postgresql":
+            sql = f"SELECT GREATEST(reltuples, 0)::bigint AS total FROM pg_class WHERE oid = '{self.tabela_estimativa}'::regclass"
+            df = ler_sql(engine, sql, self.tabelas)
+            if not df.empty and int(df["total"].iloc[0]) > 0:
+                return int(df["total"].iloc[0]), True
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        df = ler_sql(engine, f"SELECT COUNT(*) AS total FROM {self.origem} {where}", self.tabelas, params)
+        return int(df["total"].iloc[0]), False
+
+
+def _escalar(valor):
+    if valor is None or valor != valor:  # NaN/NaT
+        return None
+    if hasattr(valor, "to_pydatetime"):
+        return valor.to_pydatetime()
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+# === CONSULTAS DAS GRADES ===
+# Acompanhamento e Tabela Geral leem o modelo de leitura producao_leitura
+# (join já resolvido, ver sql/002_producao_leitura.sql). As tags de cache
+# continuam sendo as tabelas de origem, que são as que as páginas gravam.
+# Cada grade busca só as colunas que exibe (os ids das tabelas de referência
+# ficam de fora) e recebe as colunas de status como category.
+COLUNAS_PRODUCAO = {
+    nome: nome
+    for nome in (
+        "id", "numero_pedido", "descricao", "status_tecido", "faturamento", "logistica",
+        "nota_fiscal", "ordem_fabricacao", "tecido", "data_entrega", "cor_prioridade",
+    )
+}
+STATUS_PRODUCAO = ("status_tecido", "faturamento", "logistica", "cor_prioridade")
+
+CONSULTA_TABELA_GERAL = ConsultaPaginada(
+    selecao="""id, numero_pedido, hospital, data_emissao, codigo_material, descricao, quantidade,
+               valor_unitario, status_tecido, faturamento, logistica, data_faturamento, nota_fiscal,
+               ordem_fabricacao, quantidade_op, consumo, tecido, data_entrega, cor_prioridade""",
+    origem="producao_leitura",
+    chave="id",
+    colunas=COLUNAS_PRODUCAO,
+    tabelas=("producao", "itens_pedido", "pedidos"),
+    tabela_estimativa="producao_leitura",
+    categoricas=("hospital", *STATUS_PRODUCAO),
+)
+
+CONSULTA_PEDIDOS = ConsultaPaginada(
+    selecao="id, numero_pedido, data_emissao, hospital, endereco_entrega, estado, uf",
+    origem="pedidos",
+    chave="id",
+    colunas={
+        "id": "id",
+        "numero_pedido": "numero_pedido",
+        "data_emissao": "data_emissao",
+        "hospital": "hospital",
+        "endereco_entrega": "endereco_entrega",
+        "estado": "estado",
+        "uf": "uf",
+    },
+    tabelas=("pedidos",),
+    tabela_estimativa="pedidos",
+    categoricas=("hospital", "estado", "uf"),
+)
+
+# Acompanhamento: traz a versão de cada linha (concorrência otimista) e o
+# ponto de partida do feed de alterações, lido no mesmo snapshot da página
+CONSULTA_ACOMPANHAMENTO = ConsultaPaginada(
+    selecao="""id, numero_pedido, descricao, status_tecido, faturamento, logistica,
+               nota_fiscal, ordem_fabricacao, quantidade_op, consumo, tecido,
+               versao, (SELECT desde FROM producao_feed) AS versao_desde""",
+    origem="producao_leitura",
+    chave="id",
+    colunas={nome: expr for nome, expr in COLUNAS_PRODUCAO.items() if nome not in ("data_entrega", "cor_prioridade")},
+    tabelas=("producao", "itens_pedido", "pedidos"),
+    tabela_estimativa="producao_leitura",
+    # Editáveis ficam no tipo lido: o st_aggrid devolve cada coluna convertida
+    # para o dtype do quadro enviado. Um int8 estouraria, e um category (só com
+    # os valores da página) viraria NaN para qualquer opção ausente dela.
+    sem_compactar=("status_tecido", "faturamento", "logistica", "quantidade_op", "consumo"),
+)
@@ -0,0 +1,41 @@
+import importlib
+from dataclasses import dataclass
+
+# === REGISTRO DE PAGINAS ===
+# Cada página é um módulo com exibir(engine), importado só quando a página é
+# aberta pela primeira vez no processo: PyMuPDF só carrega no Upload, AgGrid
+# só nas páginas com grade.
+
+
+@dataclass(frozen=True)
+class Pagina:
+    rotulo: str
+    modulo: str
+    admin: bool = False
+
+
+PAGINAS = (
+    Pagina("🏠 Home", "paginas.home"),
+    Pagina("📥 Upload", "paginas.upload"),
+    Pagina("🧾 Produção", "paginas.producao"),
+    Pagina("📋 Tabela de Pedidos", "paginas.tabela_pedidos"),
+    Pagina("📊 Tabela Geral", "paginas.tabela_geral"),
+    Pagina("📈 Acompanhamento", "paginas.acompanhamento"),
+    Pagina("🚚 Logística", "paginas.logistica"),
+    Pagina("🧮 Painel", "paginas.painel"),
+    Pagina("⏳ Tarefas", "paginas.tarefas"),
+    Pagina("🩺 Diagnóstico", "paginas.admin", admin=True),
+)
+
+_POR_ROTULO = {pagina.rotulo: pagina for pagina in PAGINAS}
+
+
+def opcoes_menu(eh_admin=False):
+    return [pagina.rotulo for pagina in PAGINAS if eh_admin or not pagina.admin]
+
+
+def exibir(rotulo, engine, eh_admin=False):
+    pagina = _POR_ROTULO[rotulo]
+    if pagina.admin and not eh_admin:
+        return
+    importlib.import_module(pagina.modulo).exibir(engine)
@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+from cache import invalidar
+from grade_alteracoes import alteracoes_desde, mesclar, preparar_para_grade, salvar_diferencas
+from paginacao import CONSULTA_ACOMPANHAMENTO
+from paginas.estilo import aplicar_estilo_grade
+from paginas.grade import grade_paginada
+
+
+def _atualizar(engine, estado):
+    # Feed de alterações: só as linhas da página gravadas desde a última leitura
+    with engine.connect() as conn:
+        alteradas, estado["desde"] = alteracoes_desde(
+            conn, CONSULTA_ACOMPANHAMENTO, estado["desde"], estado["quadro"]["id"].tolist()
+        )
+    if not alteradas.empty:
+        mesclado = mesclar(estado["quadro"], alteradas.drop(columns="versao_desde"))
+        estado["quadro"] = CONSULTA_ACOMPANHAMENTO.compactar(mesclado)
+    return len(alteradas)
+
+
+# === ACOMPANHAMENTO DA PRODUCAO ===
+def exibir(engine):
+    aplicar_estilo_grade()
+
+    st.title("📈 Acompanhamento da Produção")
+    try:
+        atualizar = st.button("🔄 Atualizar")
+        df_pagina, pagina = grade_paginada(engine, CONSULTA_ACOMPANHAMENTO, "acompanhamento")
+
+        # Quadro da página fica na sessão, com a versão de cada linha e o ponto
+        # de partida do feed: Atualizar e Salvar trazem só o que mudou
+        estado = st.session_state.get("acompanhamento_original")
+        if estado is None or estado["pagina"] != pagina:
+            estado = {
+                "pagina": pagina,
+                "quadro": df_pagina.drop(columns="versao_desde"),
+                "desde": int(df_pagina["versao_desde"].iloc[0]) if not df_pagina.empty else None,
+            }
+            st.session_state["acompanhamento_original"] = estado
+        elif atualizar:
+            st.toast(f"🔄 {_atualizar(engine, estado)} linha(s) alterada(s) desde a última leitura")
+        df = estado["quadro"]
+
+        # Resultado do último salvamento (mostrado depois do rerun)
+        aviso = st.session_state.pop("acompanhamento_aviso", None)
+        if aviso is not None:
+            gravadas, conflitos, invalidas = aviso
+            if gravadas:
+                st.success(f"✅ {gravadas} linha(s) alterada(s) salva(s) com sucesso!")
+            if conflitos:
+                st.warning(
+                    f"⚠️ {len(conflitos)} linha(s) não foram salvas: outro operador alterou as mesmas colunas. "
+                    "A grade já mostra os valores atuais; refaça a edição se ainda for o caso."
+                )
+                st.dataframe(pd.DataFrame(conflitos), hide_index=True)
+            if invalidas:
+                st.error(
+                    f"❌ {len({i['id'] for i in invalidas})} linha(s) não foram salvas: valores que não são números. "
+                    "Corrija e salve de novo (use vírgula ou ponto como separador decimal, sem separador de milhar)."
+                )
+                st.dataframe(pd.DataFrame(invalidas).astype({"valor": str}), hide_index=True)
+            if not gravadas and not conflitos and not invalidas:
+                st.info("Nenhuma alteração para salvar.")
+
+        opcoes_status_tecido = ["", "COMPRADO", "RECEBIDO", "CORTADO"]
+        opcoes_faturamento = ["", "EXPEDICAO", "FATURADO", "OK"]
+        opcoes_logistica = ["", "PALETE", "PAVÃO", "ENTREGUE"]
+
+        # A versão não vai ao navegador: o salvamento usa a do quadro da sessão
+        df_grade = preparar_para_grade(df.drop(columns="versao"))
+        gb = GridOptionsBuilder.from_dataframe(df_grade)
+        gb.configure_default_column(filter=False, sortable=False, editable=True, groupable=True)
+
+        gb.configure_column("status_tecido", editable=True, cellEditor='agSelectCellEditor', cellEditorParams={"values": opcoes_status_tecido})
+        gb.configure_column("faturamento", editable=True, cellEditor='agSelectCellEditor', cellEditorParams={"values": opcoes_faturamento})
+        gb.configure_column("logistica", editable=True, cellEditor='agSelectCellEditor', cellEditorParams={"values": opcoes_logistica})
+
+
+        grid_options = gb.build()
+
+        grid_response = AgGrid(
+            df_grade,
+            gridOptions=grid_options,
+            theme="streamlit",
+            update_mode=GridUpdateMode.VALUE_CHANGED,
+            allow_unsafe_jscode=True,
+            enable_enterprise_modules=True,
+            height=500
+        )
+
+        edited_df = grid_response["data"]
+        if st.button("💾 Salvar Alterações"):
+            try:
+                with engine.begin() as conn:
+                    gravadas, conflitos, invalidas = salvar_diferencas(conn, df, edited_df)
+                invalidar("producao")
+                # Traz as linhas gravadas (versão nova) e as que outros alteraram
+                _atualizar(engine, estado)
+                st.session_state["acompanhamento_aviso"] = (gravadas, conflitos, invalidas)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Erro ao salvar: {e}")
+    except Exception as e:
+        st.error(f"Erro ao carregar: {e}")
@@ -0,0 +1,35 @@
+import streamlit as st
+import pandas as pd
+
+from banco import estatisticas_pool
+from diagnostico import REGISTRO, consultas_lentas, execucoes_por_sessao, tamanhos_grades, tempos_por_pagina
+
+
+# === DIAGNOSTICO (SOMENTE ADMIN) ===
+def exibir(engine):
+    st.title("🩺 Diagnóstico")
+    st.caption(f"Últimos {len(REGISTRO.eventos)} evento(s) em memória (máximo {REGISTRO.eventos.maxlen}).")
+
+    if st.button("🧹 Limpar medições"):
+        REGISTRO.limpar()
+
+    st.subheader("Consultas mais lentas")
+    st.dataframe(consultas_lentas(), width="stretch", hide_index=True)
+
+    st.subheader("Tempo por página (execução do script)")
+    st.dataframe(tempos_por_pagina(), width="stretch", hide_index=True)
+
+    st.subheader("Grades: memória e bytes enviados por rerun")
+    st.dataframe(tamanhos_grades(), width="stretch", hide_index=True)
+
+    st.subheader("Execuções por sessão")
+    st.dataframe(execucoes_por_sessao(), width="stretch", hide_index=True)
+
+    st.subheader("Leituras de PDF recentes")
+    pdfs = REGISTRO.quadro("pdf")
+    if not pdfs.empty:
+        pdfs["quando"] = pd.to_datetime(pdfs["quando"], unit="s")
+        st.dataframe(pdfs.sort_values("quando", ascending=False).head(50), width="stretch", hide_index=True)
+
+    with st.expander("📊 Pool de conexões"):
+        st.json(estatisticas_pool())
@@ -0,0 +1,69 @@
+import streamlit as st
+
+# === ESTILOS ===
+# Montados uma vez, na importação do módulo; cada execução só reenvia a
+# string pronta (o Streamlit descarta o que não for emitido no rerun).
+
+# Estilo global customizado + desativar autocomplete de campos text_input
+CSS_GLOBAL = """
+    <style>
+    /* Remove a borda superior do conteúdo principal */
+    section.main > div:first-child {
+        border-top: none !important;
+    }
+
+    /* Remove qualquer sobra superior */
+    .block-container {
+        padding-top: 0rem !important;
+    }
+
+    header {visibility: hidden;}
+    [data-testid="stDeployButton"] {display: none !important;}
+
+    /* Títulos menores */
+    h1, h2, h3, h4, h5, h6 {
+        font-size: 18px !important;
+        margin-bottom: 8px;
+    }
+    input[type="text"], input[type="number"] {
+        autocomplete: off !important;
+    }
+    </style>
+"""
+
+# Páginas com AgGrid em largura total e sem bordas
+CSS_GRADE = """
+        <style>
+        .block-container {
+            padding: 0rem 1rem !important;
+            margin: 0 auto !important;
+            max-width: 100% !important;
+        }
+        .ag-root-wrapper, .ag-theme-streamlit .ag-root-wrapper {
+            border: none !important;
+        }
+        .ag-theme-streamlit .ag-root, .ag-theme-streamlit .ag-header, .ag-theme-streamlit .ag-body {
+            border: none !important;
+            box-shadow: none !important;
+        }
+        .ag-theme-streamlit .ag-center-cols-viewport {
+            overflow-x: auto !important;
+        }
+        .ag-theme-streamlit .ag-center-cols-container {
+            min-width: 100% !important;
+        }
+        .ag-theme-streamlit {
+            width: 100% !important;
+            max-width: 100vw !important;
+            margin-left: 0 !important;
+            margin-right: 0 !important;
+        }
+"""
+
+
+def aplicar_estilo_global():
+    st.markdown(CSS_GLOBAL, unsafe_allow_html=True)
+
+
+def aplicar_estilo_grade():
+    st.markdown(CSS_GRADE, unsafe_allow_html=True)
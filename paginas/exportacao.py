@@ -0,0 +1,56 @@
+import streamlit as st
+
+from exportacao import FORMATOS, exportar
+from paginas.tarefas import painel_tarefa
+from tarefas import CONCLUIDA, TAREFAS
+
+
+# === TAREFA DE EXPORTACAO (RODA FORA DO SCRIPT) ===
+def _exportar(progresso, engine, consulta, filtros, ordem, formato, nome):
+    total, estimado = consulta.total(engine, filtros)
+    aprox = "~" if estimado else ""
+    sql, params = consulta.sql_completo(filtros, ordem)
+
+    def ao_progredir(linhas):
+        progresso(linhas / total if total else 0, f"{linhas} de {aprox}{total} linha(s) gravada(s)")
+
+    return exportar(engine, sql, params, formato, nome, ao_progredir=ao_progredir)
+
+
+# === EXPORTAR A GRADE COM OS FILTROS ATUAIS ===
+def exportacao_grade(engine, consulta, chave, assinatura):
+    # assinatura: a devolvida por grade_paginada (filtros, ordem, direção, tamanho)
+    filtros, ordem, crescente, _ = assinatura
+    filtros = {nome: valor for nome, valor in filtros if valor}
+    chave_tarefa = f"{chave}_exportacao"
+
+    with st.expander("⬇️ Exportar"):
+        descricao_filtros = ", ".join(f"{nome} contém '{valor}'" for nome, valor in filtros.items()) or "sem filtros"
+        st.caption(f"Todas as linhas da grade ({descricao_filtros}), ordenadas por {ordem}.")
+        col_formato, col_botao = st.columns([3, 1])
+        formato = col_formato.radio("Formato", list(FORMATOS), horizontal=True, key=f"{chave}_formato")
+        if col_botao.button("Gerar arquivo", key=f"{chave}_exportar"):
+            st.session_state[chave_tarefa] = TAREFAS.submeter(
+                "exportacao", f"Exportação {chave} ({formato})", _exportar,
+                engine, consulta, filtros, (ordem, crescente), formato, chave,
+            )
+
+        tarefa = TAREFAS.obter(st.session_state.get(chave_tarefa))
+        if tarefa is None:
+            return
+        if not tarefa.terminada:
+            painel_tarefa(tarefa.id)
+        elif tarefa.estado == CONCLUIDA and tarefa.resultado is not None:
+            resultado = tarefa.resultado
+            tamanho_mb = resultado["bytes"] / 1024 / 1024
+            # Link para o arquivo estático: o navegador baixa direto do disco do servidor
+            st.markdown(
+                f'<a href="{resultado["url"]}" download="{resultado["arquivo"]}">📄 Baixar {resultado["arquivo"]}</a>'
+                f' · {resultado["linhas"]} linha(s) · {tamanho_mb:.1f} MB',
+                unsafe_allow_html=True,
+            )
+        elif tarefa.estado == CONCLUIDA:
+            # Resultado descartado pelo limite de memória das tarefas
+            st.info("O link deste arquivo não está mais disponível. Gere o arquivo de novo.")
+        else:
+            st.error(f"Erro na exportação: {tarefa.erro or tarefa.mensagem}")
@@ -0,0 +1,53 @@
+import streamlit as st
+
+from diagnostico import medir
+from quadros import bytes_payload, memoria, memoria_objetos
+
+
+# === GRADE PAGINADA NO SERVIDOR ===
+def grade_paginada(engine, consulta, chave, tamanhos=(50, 100, 250, 500)):
+    # Filtros/ordenação viram WHERE/ORDER BY; só a página visível é buscada.
+    # Devolve o quadro da página e uma identificação da página exibida.
+    estado = st.session_state.setdefault(f"{chave}_paginacao", {"assinatura": None, "cursores": [None], "proximo": None})
+    nomes = list(consulta.colunas)
+
+    with st.expander("🔎 Filtros e ordenação"):
+        colunas_filtro = st.columns(4)
+        filtros = {
+            nome: colunas_filtro[i % 4].text_input(nome, key=f"{chave}_filtro_{nome}")
+            for i, nome in enumerate(nomes)
+        }
+        col_ordem, col_direcao, col_tamanho = st.columns(3)
+        ordem = col_ordem.selectbox("Ordenar por", nomes, index=nomes.index("id"), key=f"{chave}_ordem")
+        crescente = col_direcao.radio("Direção", ["Decrescente", "Crescente"], horizontal=True, key=f"{chave}_direcao") == "Crescente"
+        tamanho = col_tamanho.selectbox("Linhas por página", tamanhos, index=1, key=f"{chave}_tamanho")
+
+    assinatura = (tuple(sorted(filtros.items())), ordem, crescente, tamanho)
+    if estado["assinatura"] != assinatura:
+        estado.update(assinatura=assinatura, cursores=[None], proximo=None)
+
+    cursor = estado["cursores"][-1]
+    with medir("grade", chave) as dados:
+        df, estado["proximo"] = consulta.pagina(engine, filtros, (ordem, crescente), cursor, tamanho)
+        # Tamanhos por rerun (página 🩺 Diagnóstico): quadro em memória, bytes
+        # enviados ao navegador e quadros guardados na sessão
+        dados.update(
+            linhas=len(df),
+            memoria_quadro=memoria(df),
+            bytes_enviados=bytes_payload(df),
+            memoria_sessao=memoria_objetos(st.session_state.values()),
+        )
+    total, estimado = consulta.total(engine, filtros)
+
+    # Navegação por callbacks: o novo cursor já vale no rerun do clique
+    col_primeira, col_anterior, col_info, col_proxima = st.columns([1, 1, 3, 1])
+    col_primeira.button("⏮️ Primeira", key=f"{chave}_primeira", disabled=cursor is None,
+                        on_click=lambda: estado.update(cursores=[None]))
+    col_anterior.button("◀️ Anterior", key=f"{chave}_anterior", disabled=cursor is None,
+                        on_click=lambda: estado["cursores"].pop())
+    col_proxima.button("Próxima ▶️", key=f"{chave}_proxima", disabled=estado["proximo"] is None,
+                       on_click=lambda: estado["cursores"].append(estado["proximo"]))
+    paginas = max(1, -(-total // tamanho))
+    aprox = "~" if estimado else ""
+    col_info.caption(f"Página {len(estado['cursores'])} de {aprox}{paginas} · {aprox}{total} registro(s)")
+    return df, (assinatura, cursor)
@@ -0,0 +1,12 @@
+import streamlit as st
+
+from banco import estatisticas_pool
+
+
+# === HOME ===
+def exibir(engine):
+    st.title("🏠 Bem-vindo ao Sistema de Produção")
+    st.write("Use o menu lateral para navegar entre as opções.")
+
+    with st.expander("📊 Pool de conexões"):
+        st.json(estatisticas_pool())
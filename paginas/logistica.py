@@ -0,0 +1,65 @@
+import streamlit as st
+from sqlalchemy import text
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+from cache import invalidar, ler_sql
+
+
+# === TABELA LOGISTICA ===
+def exibir(engine):
+    st.title("🚚 Cadastro de Logística")
+
+    df_logistica = ler_sql(engine, "SELECT id, nome FROM logistica ORDER BY id DESC", tabelas=("logistica",))
+
+    nome_novo = st.text_input("Nome da logística", key="nome_logistica")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        if st.button("Adicionar"):
+            if nome_novo.strip() == "":
+                st.warning("Informe o nome da logística.")
+            else:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            text("INSERT INTO logistica (nome) VALUES (:nome)"),
+                            {"nome": nome_novo.strip().upper()}
+                        )
+                    invalidar("logistica")
+                    st.success("Logística adicionada com sucesso!")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Erro ao salvar: {e}")
+
+    st.markdown("---")
+
+    # Tabela com opção de seleção
+    gb = GridOptionsBuilder.from_dataframe(df_logistica)
+    gb.configure_selection("single", use_checkbox=True)
+    gb.configure_columns(df_logistica.columns, editable=False)
+    grid_options = gb.build()
+
+    grid_response = AgGrid(
+        df_logistica,
+        gridOptions=grid_options,
+        update_mode=GridUpdateMode.SELECTION_CHANGED,
+        theme="streamlit",
+        height=300
+    )
+
+    selected_row = grid_response["selected_rows"]
+
+    if selected_row is not None and not selected_row.empty:
+        id_selecionado = selected_row.iloc[0]['id']
+        nome_selecionado = selected_row.iloc[0]['nome']
+        st.warning(f"Selecionado: {nome_selecionado}")
+
+        if st.button("❌ Excluir Selecionado"):
+            with engine.begin() as conn:
+                conn.execute(
+                    text("DELETE FROM logistica WHERE id = :id"),
+                    {"id": int(id_selecionado)}
+                )
+            invalidar("logistica")
+            st.success("Registro excluído com sucesso!")
+            st.rerun()
@@ -0,0 +1,82 @@
+import time
+
+import streamlit as st
+import pandas as pd
+from cache import ler_sql
+from esquema import consolidar_resumo
+
+# === PAINEL DE PRODUÇÃO ===
+# Totais lidos de producao_resumo_atual (sql/003_producao_resumo.sql): resumo
+# consolidado + deltas gravados pelos gatilhos. O custo da página não cresce
+# com o tamanho da produção. Os deltas são dobrados no consolidado ao fim da
+# atualização diária e do importador, e de tempos em tempos por esta página,
+# para a soma da leitura continuar pequena.
+
+CONSOLIDAR_A_CADA = 60  # segundos
+_ultima_consolidacao = 0.0
+
+DIMENSOES = {
+    "cor_prioridade": "Prioridade",
+    "status_tecido": "Status do Tecido",
+    "faturamento": "Faturamento",
+    "logistica": "Logística",
+    "hospital": "Hospital",
+    "semana_entrega": "Semana de Entrega",
+}
+MEDIDAS = {"linhas": "Linhas de produção", "quantidade": "Quantidade", "valor_total": "Valor (R$)"}
+TABELAS = ("producao", "itens_pedido", "pedidos", "status_tecido", "status_faturamento", "logistica")
+
+
+def _moeda(valor):
+    return f"R$ {valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _consolidar(engine):
+    # No máximo uma vez por CONSOLIDAR_A_CADA no processo; no SQLite o resumo é uma view
+    global _ultima_consolidacao
+    if engine.dialect.name != "postgresql" or time.monotonic() - _ultima_consolidacao < CONSOLIDAR_A_CADA:
+        return
+    _ultima_consolidacao = time.monotonic()
+    consolidar_resumo(engine)
+
+
+def exibir(engine):
+    st.title("🧮 Painel de Produção")
+    try:
+        _consolidar(engine)
+        df = ler_sql(engine, "SELECT dimensao, valor, linhas, quantidade, valor_total FROM producao_resumo_atual", TABELAS)
+    except Exception as e:
+        st.error(f"Erro ao carregar o resumo: {e}")
+        return
+
+    # numeric do Postgres chega como Decimal
+    for medida in MEDIDAS:
+        df[medida] = pd.to_numeric(df[medida]).fillna(0)
+    df["valor"] = df["valor"].replace("", "(sem valor)")
+
+    # Toda linha de produção aparece uma vez em cada dimensão
+    totais = df[df["dimensao"] == "cor_prioridade"][list(MEDIDAS)].sum()
+    col_linhas, col_quantidade, col_valor = st.columns(3)
+    col_linhas.metric(MEDIDAS["linhas"], f"{int(totais['linhas']):,}".replace(",", "."))
+    col_quantidade.metric(MEDIDAS["quantidade"], f"{int(totais['quantidade']):,}".replace(",", "."))
+    col_valor.metric(MEDIDAS["valor_total"], _moeda(totais["valor_total"]))
+
+    medida = st.radio("Medida", list(MEDIDAS), format_func=MEDIDAS.get, horizontal=True)
+
+    for aba, (dimensao, rotulo) in zip(st.tabs(list(DIMENSOES.values())), DIMENSOES.items()):
+        with aba:
+            parte = df[df["dimensao"] == dimensao].drop(columns="dimensao").rename(columns={"valor": rotulo})
+            if dimensao == "semana_entrega":
+                parte = parte.sort_values(rotulo)
+            else:
+                parte = parte.sort_values(medida, ascending=False)
+            if parte.empty:
+                st.info("Sem dados.")
+                continue
+            st.bar_chart(parte, x=rotulo, y=medida, y_label=MEDIDAS[medida], sort=False)
+            st.dataframe(
+                parte.rename(columns=MEDIDAS),
+                width="stretch",
+                hide_index=True,
+                column_config={MEDIDAS["valor_total"]: st.column_config.NumberColumn(format="R$ %.2f")},
+            )
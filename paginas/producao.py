@@ -0,0 +1,127 @@
+import datetime
+
+import streamlit as st
+from sqlalchemy import text
+
+from busca_itens import indice_desatualizado, obter_indice
+from cache import invalidar
+from paginas.tarefas import painel_tarefa
+from prioridade import atualizar_prioridades_diario, recalcular_prioridades
+from referencias import carregar_referencias
+from tarefas import CONCLUIDA, TAREFAS
+
+
+def _atualizar_prioridades(progresso, engine):
+    progresso(0.1, "Recalculando data de entrega e cor de todas as linhas...")
+    atualizadas = atualizar_prioridades_diario(engine)
+    invalidar("producao")
+    progresso(1.0, f"{atualizadas} linha(s) de produção atualizada(s)")
+    return atualizadas
+
+
+# === CADASTRO DE PRODUCAO ===
+def exibir(engine):
+    st.title("🧾 Cadastro de Produção")
+
+    # Atualização diária das cores (também disponível via "python prioridade.py").
+    # Roda como tarefa, uma por vez: quem abrir a página durante a execução acompanha a mesma.
+    em_andamento = TAREFAS.ativas("prioridades")
+    if em_andamento:
+        painel_tarefa(em_andamento[0].id)
+    elif st.button("🔄 Atualizar prioridades do dia"):
+        st.session_state["tarefa_prioridades"] = TAREFAS.submeter(
+            "prioridades", "Atualização das prioridades do dia", _atualizar_prioridades, engine
+        )
+        st.rerun()
+
+    concluida = TAREFAS.obter(st.session_state.get("tarefa_prioridades"))
+    if concluida is not None and concluida.terminada:
+        st.session_state.pop("tarefa_prioridades")
+        TAREFAS.descartar_resultado(concluida.id)
+        if concluida.estado == CONCLUIDA:
+            st.success(f"✅ {concluida.mensagem}.")
+        else:
+            st.error(f"Erro ao atualizar prioridades: {concluida.erro or concluida.mensagem}")
+
+    try:
+        indice_itens = obter_indice(engine)
+    except Exception as e:
+        st.error(f"Erro ao carregar itens: {e}")
+        st.stop()
+
+    # Busca por prefixo no índice em memória: só as melhores opções vão ao navegador
+    busca = st.text_input("Buscar produto (nº do pedido e/ou descrição)", key="busca_item", placeholder="Digite para buscar...")
+    encontrados = indice_itens.buscar(busca, limite=20)
+    if indice_desatualizado():
+        st.caption("⏳ Atualizando o índice com os pedidos importados há pouco; eles aparecem em instantes.")
+    if busca and not encontrados:
+        st.info("Nenhum item encontrado.")
+    rotulos = dict(encontrados)
+    id_item = st.selectbox(
+        "Selecionar Produto para Produção",
+        options=list(rotulos),
+        format_func=lambda id_: f"{rotulos[id_]} (item {id_})",
+        index=None,
+        placeholder="Selecione entre os resultados...",
+    )
+
+    if id_item:
+        referencias = carregar_referencias(engine)
+
+        with st.form("form_producao"):
+            status_tecido = st.selectbox("Status do Tecido", options=[""] + list(referencias["status_tecido"].nomes), index=0, placeholder="(opcional)")
+            faturamento = st.selectbox("Faturamento", options=[""] + list(referencias["status_faturamento"].nomes), index=0, placeholder="(opcional)")
+            logistica = st.selectbox("Logística", options=[""] + list(referencias["logistica"].nomes), index=0, placeholder="(opcional)")
+
+            nota_fiscal = st.text_input("Nota Fiscal", value="", key="nota_fiscal")
+            ordem_fabricacao = st.text_input("Ordem de Fabricação", value="", key="ordem_fabricacao")
+            quantidade_op = st.number_input("Quantidade OP", min_value=0, step=1)
+            consumo = st.number_input("Consumo por Peça", min_value=0.0, step=0.01)
+            tecido = st.text_input("Tecido", value="", key="tecido")
+
+            submit = st.form_submit_button("Salvar Produção")
+
+            if submit:
+                with st.spinner("Salvando dados..."):
+                    data_faturamento = datetime.date.today() if faturamento == "OK" else None
+
+                    # Inserção na tabela de produção com os IDs corretos
+                    with engine.begin() as conn:
+                        id_producao = conn.execute(
+                            text("""
+                                INSERT INTO producao (
+                                    id_item_pedido, status_tecido_id, faturamento_id, data_faturamento, 
+                                    nota_fiscal, ordem_fabricacao, quantidade_op, consumo, tecido, logistica_id
+                                ) VALUES (
+                                    :id_item_pedido, :status_tecido_id, :faturamento_id, :data_faturamento, 
+                                    :nota_fiscal, :ordem_fabricacao, :quantidade_op, :consumo, :tecido, :logistica_id
+                                )
+                                RETURNING id
+                            """),
+                            {
+                                "id_item_pedido": int(id_item),
+                                "status_tecido_id": referencias["status_tecido"].id(status_tecido),
+                                "faturamento_id": referencias["status_faturamento"].id(faturamento),
+                                "data_faturamento": data_faturamento,
+                                "nota_fiscal": nota_fiscal,
+                                "ordem_fabricacao": ordem_fabricacao,
+                                "quantidade_op": int(quantidade_op),
+                                "consumo": float(consumo),
+                                "tecido": tecido,
+                                "logistica_id": referencias["logistica"].id(logistica)
+                            }
+                        ).scalar_one()
+
+
+                    st.success("✅ Produção salva com sucesso!")
+                    # Atualizar data_entrega e cor_prioridade (só da linha salva)
+                    try:
+                        with engine.begin() as conn:
+                            recalcular_prioridades(conn, [id_producao])
+                    except Exception as e:
+                        st.error(f"Erro ao atualizar campos automáticos: {e}")
+                    invalidar("producao")
+
+                for key in st.session_state.keys():
+                    del st.session_state[key]
+                st.rerun()
@@ -0,0 +1,47 @@
+import streamlit as st
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+from paginacao import CONSULTA_TABELA_GERAL
+from paginas.estilo import aplicar_estilo_grade
+from paginas.exportacao import exportacao_grade
+from paginas.grade import grade_paginada
+
+
+# === TABELA GERAL ===
+def exibir(engine):
+    aplicar_estilo_grade()
+
+    st.title("📊 Tabela Geral de Produção")
+    try:
+        df, (assinatura, _) = grade_paginada(engine, CONSULTA_TABELA_GERAL, "tabela_geral")
+        exportacao_grade(engine, CONSULTA_TABELA_GERAL, "tabela_geral", assinatura)
+
+        # Configuração visual da tabela
+        gb = GridOptionsBuilder.from_dataframe(df)
+        # Sem agrupamento no navegador (só agruparia a página visível): totais ficam no 🧮 Painel
+        gb.configure_default_column(filter=False, sortable=False, editable=False, groupable=False)
+        grid_options = gb.build()
+        grid_options["domLayout"] = "autoHeight"  # Altura automática
+        grid_options['suppressRowClickSelection'] = True
+
+        AgGrid(
+            df,
+            gridOptions=grid_options,
+            update_mode=GridUpdateMode.NO_UPDATE,
+            fit_columns_on_grid_load=False,  # Desliga o ajuste automático
+            theme="streamlit",
+            height=600,
+            allow_unsafe_jscode=True,
+            enable_enterprise_modules=True,
+            custom_css={
+                ".ag-root-wrapper": {"border": "none"},
+                ".ag-header": {"border-bottom": "none"},
+                ".ag-cell": {"border-bottom": "none"},
+                ".ag-row": {"border": "none"},
+                ".ag-theme-streamlit": {"padding": "0px", "margin": "0 auto", "width": "100%"},
+            }
+        )
+
+
+    except Exception as e:
+        st.error(f"Erro ao carregar: {e}")
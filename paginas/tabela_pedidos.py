@@ -0,0 +1,23 @@
+import streamlit as st
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+from paginacao import CONSULTA_PEDIDOS
+from paginas.estilo import aplicar_estilo_grade
+from paginas.exportacao import exportacao_grade
+from paginas.grade import grade_paginada
+
+
+# === TABELA DE PEDIDOS ===
+def exibir(engine):
+    aplicar_estilo_grade()
+
+    st.title("📋 Tabela de Pedidos")
+    try:
+        df, (assinatura, _) = grade_paginada(engine, CONSULTA_PEDIDOS, "pedidos")
+        exportacao_grade(engine, CONSULTA_PEDIDOS, "pedidos", assinatura)
+        gb = GridOptionsBuilder.from_dataframe(df)
+        gb.configure_default_column(filter=False, sortable=False, editable=False, groupable=True)
+        grid_options = gb.build()
+        AgGrid(df, gridOptions=grid_options, update_mode=GridUpdateMode.NO_UPDATE, fit_columns_on_grid_load=True)
+    except Exception as e:
+        st.error(f"Erro ao carregar: {e}")
@@ -0,0 +1,47 @@
+import streamlit as st
+import pandas as pd
+
+from tarefas import TAREFAS
+
+
+# === ANDAMENTO DE UMA TAREFA (USADO PELAS PAGINAS QUE SUBMETEM) ===
+@st.fragment(run_every=1)
+def painel_tarefa(id_tarefa):
+    # Só este trecho é reexecutado a cada segundo; quando a tarefa termina,
+    # a página inteira roda de novo para mostrar o resultado
+    tarefa = TAREFAS.obter(id_tarefa)
+    if tarefa is None:
+        st.warning("Tarefa não encontrada.")
+        return
+    if tarefa.terminada:
+        st.rerun()
+    texto = f"{tarefa.descricao} · {tarefa.mensagem or tarefa.estado.lower()}"
+    st.progress(tarefa.progresso, text=texto)
+    st.caption("Pode sair desta página: a tarefa continua e aparece em ⏳ Tarefas.")
+
+
+# === LISTA DE TAREFAS ===
+@st.fragment(run_every=2)
+def _lista():
+    tarefas = TAREFAS.listar()
+    for tarefa in [t for t in tarefas if not t.terminada]:
+        st.progress(tarefa.progresso, text=f"{tarefa.descricao} · {tarefa.mensagem or tarefa.estado.lower()}")
+
+    if not tarefas:
+        st.info("Nenhuma tarefa.")
+        return
+    df = pd.DataFrame([t.registro() for t in tarefas])
+    df["progresso"] = (df["progresso"] * 100).round().astype(int)
+    colunas = ["estado", "descricao", "progresso", "mensagem", "erro", "criada_em", "iniciada_em", "concluida_em", "tipo", "id"]
+    st.dataframe(
+        df[colunas],
+        width="stretch",
+        hide_index=True,
+        column_config={"progresso": st.column_config.ProgressColumn("progresso", min_value=0, max_value=100, format="%d%%")},
+    )
+
+
+def exibir(engine):
+    st.title("⏳ Tarefas")
+    st.caption("Operações em segundo plano (atualiza sozinho).")
+    _lista()
@@ -0,0 +1,154 @@
+import streamlit as st
+import pandas as pd
+
+from cache import invalidar
+from extracao_pdf import extrair_dados_pdf_cache, hash_conteudo
+from importacao_lote import aceitos, classificar_lote, expandir_arquivos, extrair_lote, resumo_lote
+from paginas.tarefas import painel_tarefa
+from persistencia import pedidos_existentes, salvar_pedidos
+from tarefas import CONCLUIDA, TAREFAS
+
+
+# === TAREFAS DO UPLOAD (RODAM FORA DO SCRIPT) ===
+def _extrair_pdf(progresso, conteudo, chave):
+    progresso(0.1, "Lendo PDF...")
+    pedido, itens = extrair_dados_pdf_cache(conteudo, chave)
+    progresso(1.0, f"{len(itens)} item(ns) lidos")
+    return pedido, itens
+
+
+def _extrair_lote(progresso, conteudos):
+    def ao_progredir(concluidos, total, resultado):
+        progresso(concluidos / total, f"{concluidos}/{total} - {resultado['arquivo']}")
+
+    return extrair_lote(conteudos, ao_progredir=ao_progredir)
+
+
+def _salvar_lote(progresso, engine, pedidos):
+    progresso(0.1, f"Gravando {len(pedidos)} pedido(s)...")
+    with engine.begin() as conn:
+        salvos, duplicados = salvar_pedidos(conn, pedidos)
+    invalidar("pedidos", "itens_pedido")
+    progresso(1.0, f"{len(salvos)} pedido(s) salvos")
+    return salvos, duplicados
+
+
+def _tarefa_da_url(parametro):
+    # O id da tarefa fica na URL: recarregar a aba não perde o acompanhamento
+    tarefa = TAREFAS.obter(st.query_params.get(parametro))
+    if tarefa is None:
+        st.query_params.pop(parametro, None)
+    return tarefa
+
+
+# === IMPORTAR PDF ===
+def exibir(engine):
+    st.title("📥 Importar Pedido PDF")
+    modo = st.radio("Modo de importação", ["Arquivo único", "Lote"], horizontal=True)
+
+    if modo == "Arquivo único":
+        uploaded_file = st.file_uploader("Escolha um PDF de pedido", type="pdf")
+        if uploaded_file:
+            conteudo = uploaded_file.getvalue()
+            chave = hash_conteudo(conteudo)
+            chave_atual, id_tarefa = st.session_state.get("pdf_tarefa", (None, None))
+            anterior = TAREFAS.obter(id_tarefa)
+            # Resultado descartado (limite de memória das tarefas): lê de novo, pelo cache de PDFs
+            descartado = anterior is not None and anterior.estado == CONCLUIDA and anterior.resultado is None
+            if chave_atual != chave or anterior is None or descartado:
+                id_tarefa = TAREFAS.submeter("extrair_pdf", f"Leitura de {uploaded_file.name}", _extrair_pdf, conteudo, chave)
+                st.session_state["pdf_tarefa"] = (chave, id_tarefa)
+
+            tarefa = TAREFAS.obter(id_tarefa)
+            if not tarefa.terminada:
+                painel_tarefa(id_tarefa)
+                return
+            if tarefa.estado != CONCLUIDA:
+                st.error(f"Erro ao ler o PDF: {tarefa.erro or tarefa.mensagem}")
+                st.session_state.pop("pdf_tarefa", None)
+                return
+            pedido, itens = tarefa.resultado
+
+            st.subheader("Resumo do Pedido")
+            st.json(pedido)
+
+            st.subheader("Itens do Pedido")
+            df_itens = pd.DataFrame(itens)
+            st.dataframe(df_itens)
+
+            if st.button("Salvar no Supabase"):
+                numero_pedido = pedido["numero_pedido"]
+                with engine.begin() as conn:
+                    salvos, duplicados = salvar_pedidos(conn, [(pedido, itens)])
+                invalidar("pedidos", "itens_pedido")
+
+                if duplicados:
+                    st.warning(f"⚠️ O pedido número {numero_pedido} já foi importado.")
+                else:
+                    st.success("✅ Pedido e itens salvos com sucesso!")
+
+    else:
+        # Gravação de lote em andamento ou recém-terminada
+        gravacao = _tarefa_da_url("tarefa_salvar")
+        if gravacao is not None:
+            if not gravacao.terminada:
+                painel_tarefa(gravacao.id)
+                return
+            st.query_params.pop("tarefa_salvar", None)
+            if gravacao.estado == CONCLUIDA and gravacao.resultado is not None:
+                salvos, duplicados = gravacao.resultado
+                TAREFAS.descartar_resultado(gravacao.id)
+                st.success(f"✅ {len(salvos)} pedido(s) salvos com sucesso!")
+                if duplicados:
+                    st.warning(f"⚠️ Já importados por outro operador: {', '.join(duplicados)}")
+            elif gravacao.estado == CONCLUIDA:
+                st.success(f"✅ {gravacao.mensagem}")
+            else:
+                st.error(f"Erro ao salvar lote: {gravacao.erro or gravacao.mensagem}")
+
+        arquivos = st.file_uploader("Escolha os PDFs de pedido (ou um .zip)", type=["pdf", "zip"], accept_multiple_files=True)
+        if arquivos:
+            # A leitura roda como tarefa; cliques seguintes não reprocessam o lote
+            chave_lote = tuple((a.name, a.size) for a in arquivos)
+            if st.session_state.get("lote_chave") != chave_lote:
+                conteudos = list(expandir_arquivos((a.name, a.getvalue()) for a in arquivos))
+                st.query_params["tarefa_lote"] = TAREFAS.submeter(
+                    "extrair_lote", f"Leitura de {len(conteudos)} PDF(s)", _extrair_lote, conteudos
+                )
+                st.session_state["lote_chave"] = chave_lote
+
+        leitura = _tarefa_da_url("tarefa_lote")
+        if leitura is None:
+            return
+        if not leitura.terminada:
+            painel_tarefa(leitura.id)
+            return
+        if leitura.estado != CONCLUIDA or leitura.resultado is None:
+            # Resultado ausente: a tarefa é de antes de um reinício do processo
+            # ou o resultado saiu pelo limite de memória das tarefas
+            st.error(f"Erro ao ler o lote: {leitura.erro or leitura.mensagem}. Envie os arquivos novamente.")
+            st.query_params.pop("tarefa_lote", None)
+            return
+
+        resultados = leitura.resultado
+        numeros = [r["pedido"]["numero_pedido"] for r in resultados if r["pedido"]]
+        with engine.connect() as conn:
+            ja_importados = pedidos_existentes(conn, numeros)
+        classificar_lote(resultados, ja_importados)
+
+        st.subheader("Prévia do Lote")
+        df_resumo = resumo_lote(resultados)
+        st.dataframe(df_resumo, width="stretch")
+
+        contagem = df_resumo["status"].value_counts()
+        st.write(" | ".join(f"**{status}**: {qtd}" for status, qtd in contagem.items()))
+
+        pedidos_aceitos = aceitos(resultados)
+        if pedidos_aceitos and st.button(f"Salvar {len(pedidos_aceitos)} pedido(s) no Supabase"):
+            st.query_params["tarefa_salvar"] = TAREFAS.submeter(
+                "salvar_lote", f"Gravação de {len(pedidos_aceitos)} pedido(s)", _salvar_lote, engine, pedidos_aceitos
+            )
+            TAREFAS.descartar_resultado(leitura.id)  # os aceitos seguem com a gravação
+            st.query_params.pop("tarefa_lote", None)
+            st.session_state.pop("lote_chave", None)
+            st.rerun()
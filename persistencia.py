@@ -0,0 +1,116 @@
+from sqlalchemy import bindparam, column, table, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+# === PERSISTENCIA DE PEDIDOS EM LOTE ===
+# Cabeçalhos: um único INSERT ... ON CONFLICT (numero_pedido) DO NOTHING RETURNING.
+# Itens: um único INSERT com várias linhas (VALUES (...), (...), ...).
+# Salvar N pedidos custa 2 idas ao banco, independente do número de itens.
+# Requer o índice único de sql/001_pedidos_numero_pedido_unico.sql.
+
+# Limite de linhas por INSERT (o Postgres aceita até 65535 parâmetros por comando)
+LINHAS_POR_INSERT = 5000
+
+pedidos = table(
+    "pedidos",
+    column("id"), column("numero_pedido"), column("data_emissao"), column("hospital"),
+    column("endereco_entrega"), column("estado"), column("uf"),
+)
+
+itens_pedido = table(
+    "itens_pedido",
+    column("id_pedido"), column("codigo_material"), column("descricao"),
+    column("quantidade"), column("valor_unitario"), column("data_entrega"),
+)
+
+CAMPOS_PEDIDO = ["numero_pedido", "data_emissao", "hospital", "endereco_entrega", "estado", "uf"]
+CAMPOS_ITEM = ["codigo_material", "descricao", "quantidade", "valor_unitario", "data_entrega"]
+
+DIALETOS_INSERT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _lotes(linhas, tamanho=LINHAS_POR_INSERT):
+    for i in range(0, len(linhas), tamanho):
+        yield linhas[i:i + tamanho]
+
+
+def pedidos_existentes(conn, numeros):
+    if not numeros:
+        return set()
+    consulta = text("SELECT numero_pedido FROM pedidos WHERE numero_pedido IN :numeros").bindparams(bindparam("numeros", expanding=True))
+    return {str(n) for n, in conn.execute(consulta, {"numeros": list(numeros)})}
+
+
+def salvar_pedidos(conn, lista_pedidos):
+    # lista_pedidos: [(pedido, itens), ...] no formato de extrair_dados_pdf.
+    # Devolve ({numero_pedido: id}, [numeros já existentes ou repetidos]).
+    insert = DIALETOS_INSERT[conn.dialect.name]
+
+    unicos, duplicados = {}, []
+    for pedido, itens in lista_pedidos:
+        numero = str(pedido["numero_pedido"])
+        if numero in unicos:
+            duplicados.append(numero)
+        else:
+            unicos[numero] = (pedido, itens)
+    if not unicos:
+        return {}, duplicados
+
+    # Cabeçalhos: pedidos já existentes (inclusive gravados por outro operador
+    # ao mesmo tempo) são ignorados pelo ON CONFLICT e não voltam no RETURNING
+    salvos = {}
+    cabecalhos = [{campo: pedido[campo] for campo in CAMPOS_PEDIDO} for pedido, _ in unicos.values()]
+    for lote in _lotes(cabecalhos):
+        comando = (
+            insert(pedidos)
+            .values(lote)
+            .on_conflict_do_nothing(index_elements=["numero_pedido"])
+            .returning(pedidos.c.id, pedidos.c.numero_pedido)
+        )
+        salvos.update({str(numero): id_pedido for id_pedido, numero in conn.execute(comando)})
+    duplicados.extend(numero for numero in unicos if numero not in salvos)
+
+    # Itens de todos os pedidos novos em um único INSERT multi-linha
+    linhas = [
+        {"id_pedido": id_pedido, **{campo: item[campo] for campo in CAMPOS_ITEM}}
+        for numero, id_pedido in salvos.items()
+        for item in unicos[numero][1]
+    ]
+    for lote in _lotes(linhas):
+        conn.execute(insert(itens_pedido).values(lote))
+
+    return salvos, duplicados
+
+# === ATUALIZACAO EM LOTE ===
+# Um UPDATE ... FROM (VALUES ...) por lote, em vez de um executemany (um
+# comando por linha): os gatilhos por comando do Postgres (sql/002 e sql/003)
+# disparam uma vez por lote, não uma vez por linha. Os valores vão numa CTE
+# porque o SQLite não aceita nomear as colunas de um VALUES no FROM.
+
+# 1000 linhas x ~20 campos fica abaixo do limite de parâmetros do SQLite (32766)
+LINHAS_POR_UPDATE = 1000
+
+
+def atualizar_em_lote(conn, tabela, registros, tipos, atribuicoes, condicao="", chave="id"):
+    # registros: [{campo: valor}]; tipos: {campo: tipo SQL}, na ordem das
+    # colunas da CTE "v". atribuicoes e condicao usam v.<campo> e <tabela>.<coluna>.
+    # No Postgres a primeira linha leva CAST: um VALUES só de NULL ou de texto
+    # seria inferido como text (e uma coluna date não aceita text).
+    campos = list(tipos)
+    tipado = conn.dialect.name == "postgresql"
+    for lote in _lotes(registros, LINHAS_POR_UPDATE):
+        parametros, linhas = {}, []
+        for i, registro in enumerate(lote):
+            valores = []
+            for campo in campos:
+                parametros[f"{campo}_{i}"] = registro[campo]
+                valores.append(f"CAST(:{campo}_{i} AS {tipos[campo]})" if tipado and i == 0 else f":{campo}_{i}")
+            linhas.append(f"({', '.join(valores)})")
+        conn.execute(text(
+            f"WITH v ({', '.join(campos)}) AS (VALUES {', '.join(linhas)})\n"
+            f"UPDATE {tabela} SET {atribuicoes}\n"
+            f"FROM v WHERE {tabela}.{chave} = v.{chave}{' AND ' + condicao if condicao else ''}"
+        ), parametros)
+    return len(registros)
@@ -0,0 +1,82 @@
+import datetime
+import sys
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+from calendario import PULMAO_PADRAO, calcular_cor_prioridade, calcular_data_entrega
+from esquema import consolidar_resumo
+from persistencia import atualizar_em_lote
+
+# === RECALCULO DE DATA_ENTREGA / COR_PRIORIDADE ===
+# O salvamento recalcula só as linhas que tocou; a atualização diária percorre
+# a tabela inteira. Nos dois casos apenas as linhas que mudaram são gravadas,
+# em UPDATEs por lote (persistencia.atualizar_em_lote).
+
+# Lê do modelo de leitura (sql/002_producao_leitura.sql), que já traz a
+# data_emissao do pedido ao lado de cada linha de produção
+SQL_BASE = """
+    SELECT id, data_emissao, data_entrega, cor_prioridade
+    FROM producao_leitura
+"""
+
+TIPOS_UPDATE = {"id": "INTEGER", "data_entrega": "DATE", "cor_prioridade": "VARCHAR(12)"}
+ATRIBUICOES_UPDATE = "data_entrega = v.data_entrega, cor_prioridade = v.cor_prioridade"
+
+
+def _datas(serie):
+    return np.asarray(pd.to_datetime(serie).values, dtype="datetime64[D]")
+
+
+def calcular_alteracoes(df, hoje=None, pulmao=PULMAO_PADRAO):
+    # Recebe id, data_emissao e os valores atuais; devolve só as linhas alteradas
+    novo_entrega = calcular_data_entrega(df["data_emissao"], pulmao)
+    nova_cor = calcular_cor_prioridade(novo_entrega, hoje, pulmao)
+
+    entrega_nova, entrega_atual = _datas(novo_entrega), _datas(df["data_entrega"])
+    mudou_entrega = ~((entrega_nova == entrega_atual) | (np.isnat(entrega_nova) & np.isnat(entrega_atual)))
+    mudou_cor = nova_cor.fillna("").astype(str).values != df["cor_prioridade"].fillna("").astype(str).values
+    mudou = mudou_entrega | mudou_cor
+
+    return pd.DataFrame({
+        "id": df["id"].values[mudou].astype(int),
+        "data_entrega": [pd.Timestamp(d).date() if not pd.isna(d) else None for d in entrega_nova[mudou]],
+        "cor_prioridade": nova_cor.values[mudou],
+    })
+
+
+def gravar_alteracoes(conn, alteracoes):
+    if alteracoes.empty:
+        return 0
+    registros = alteracoes.astype(object).where(alteracoes.notna(), None).to_dict("records")
+    return atualizar_em_lote(conn, "producao", registros, TIPOS_UPDATE, ATRIBUICOES_UPDATE)
+
+
+def recalcular_prioridades(conn, ids_producao, hoje=None, pulmao=PULMAO_PADRAO):
+    # Usado no salvamento: só as linhas de produção informadas
+    ids = [int(i) for i in ids_producao]
+    if not ids:
+        return 0
+    consulta = text(SQL_BASE + " WHERE id IN :ids").bindparams(bindparam("ids", expanding=True))
+    df = pd.read_sql(consulta, conn, params={"ids": ids})
+    return gravar_alteracoes(conn, calcular_alteracoes(df, hoje, pulmao))
+
+
+def atualizar_prioridades_diario(engine, hoje=None, pulmao=PULMAO_PADRAO):
+    # As cores só mudam quando "hoje" avança: rodar uma vez por dia (cron ou botão).
+    # Depois do COMMIT, dobra no resumo do painel os deltas gerados pelos gatilhos.
+    with engine.begin() as conn:
+        df = pd.read_sql(text(SQL_BASE), conn)
+        atualizadas = gravar_alteracoes(conn, calcular_alteracoes(df, hoje, pulmao))
+    consolidar_resumo(engine)
+    return atualizadas
+
+
+if __name__ == "__main__":
+    # Uso: python prioridade.py [AAAA-MM-DD]
+    from banco import conectar
+
+    data = datetime.date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None
+    atualizadas = atualizar_prioridades_diario(conectar(), data)
+    print(f"{atualizadas} linha(s) de produção atualizada(s)")
@@ -0,0 +1,64 @@
+import decimal
+
+import pandas as pd
+
+# === QUADROS COMPACTOS PARA AS GRADES ===
+# Colunas de status (poucos valores distintos) viram category e os inteiros
+# usam o menor tipo que comporta os valores. Os floats (e inteiros com NULL,
+# que o read_sql entrega como float) continuam float64: um tipo menor
+# arredondaria valores editados na grade e gravados de volta.
+# O AgGrid recebe o quadro em Arrow: category vai como dicionário (cada texto
+# uma vez) e inteiros menores ocupam menos bytes.
+
+
+def compactar(df, categoricas=(), preservar=()):
+    # preservar: colunas deixadas como estão (ex.: as do cursor da paginação)
+    df = df.copy()
+    for coluna in df.columns:
+        if coluna in preservar:
+            continue
+        serie = df[coluna]
+        if coluna in categoricas:
+            df[coluna] = serie.astype("category")
+        elif serie.dtype == object and _decimal(serie):
+            # numeric do Postgres chega como Decimal (um objeto por célula)
+            df[coluna] = serie.astype("float64")
+        elif pd.api.types.is_integer_dtype(serie) and not pd.api.types.is_extension_array_dtype(serie):
+            df[coluna] = pd.to_numeric(serie, downcast="integer")
+    return df
+
+
+def _decimal(serie):
+    valores = serie.dropna()
+    return len(valores) > 0 and isinstance(valores.iloc[0], decimal.Decimal)
+
+
+# === MEDIDAS ===
+def memoria(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def bytes_payload(df):
+    # Tamanho do quadro serializado em Arrow, como o componente o envia ao navegador
+    import pyarrow as pa
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    destino = pa.MockOutputStream()
+    with pa.ipc.new_stream(destino, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return destino.size()
+
+
+def memoria_objetos(valores):
+    # Soma a memória dos quadros guardados (também dentro de tuplas, listas e dicts)
+    total = 0
+    pilha = list(valores)
+    while pilha:
+        valor = pilha.pop()
+        if isinstance(valor, pd.DataFrame):
+            total += memoria(valor)
+        elif isinstance(valor, dict):
+            pilha.extend(valor.values())
+        elif isinstance(valor, (list, tuple)):
+            pilha.extend(valor)
+    return total
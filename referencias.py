@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+import pandas as pd
+from sqlalchemy import text
+
+from cache import CacheLRU
+
+# === CACHE DAS TABELAS DE REFERENCIA ===
+# status_tecido, status_faturamento e logistica mudam raramente: são lidas
+# juntas (uma consulta) e ficam em memória até que alguém grave nelas e chame
+# cache.invalidar(<tabela>), como faz a página de Logística.
+
+TABELAS_REFERENCIA = ("status_tecido", "status_faturamento", "logistica")
+
+REFERENCIAS = CacheLRU(max_itens=1, ttl=None)
+
+
+@dataclass(frozen=True)
+class TabelaReferencia:
+    nomes: tuple
+    id_por_nome: dict
+    nome_por_id: dict
+
+    def id(self, nome):
+        return self.id_por_nome.get(nome) if nome else None
+
+
+def carregar_referencias(engine):
+    referencias = REFERENCIAS.obter("referencias")
+    if referencias is None:
+        sql = " UNION ALL ".join(
+            f"SELECT '{tabela}' AS tabela, id, nome FROM {tabela}" for tabela in TABELAS_REFERENCIA
+        )
+        df = pd.read_sql(text(sql), con=engine)
+        referencias = {}
+        for tabela in TABELAS_REFERENCIA:
+            linhas = df[df["tabela"] == tabela]
+            pares = list(zip(linhas["id"].astype(int), linhas["nome"]))
+            referencias[tabela] = TabelaReferencia(
+                nomes=tuple(sorted(nome for _, nome in pares)),
+                id_por_nome={nome: id_ for id_, nome in pares},
+                nome_por_id={id_: nome for id_, nome in pares},
+            )
+        REFERENCIAS.guardar("referencias", referencias, TABELAS_REFERENCIA)
+    return referencias
@@ -0,0 +1,6 @@
+-- Garante um pedido por numero_pedido: base do INSERT ... ON CONFLICT
+-- usado em persistencia.salvar_pedidos (importação idempotente).
+-- Antes de aplicar, confira se já existem duplicados:
+--   SELECT numero_pedido, COUNT(*) FROM pedidos GROUP BY numero_pedido HAVING COUNT(*) > 1;
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS pedidos_numero_pedido_key
+    ON pedidos (numero_pedido);
@@ -0,0 +1,169 @@
+-- Modelo de leitura da produção: producao ⋈ itens_pedido ⋈ pedidos já resolvido,
+-- mantido por gatilhos. Lido pelo Acompanhamento, pela Tabela Geral e pelo
+-- recálculo de prioridades (prioridade.SQL_BASE). Também instala a versão de
+-- linha da produção (producao.versao).
+-- Idempotente: pode ser reaplicado (psql -1 -f ou python esquema.py <url>);
+-- no fim a tabela é reconstruída a partir das tabelas de origem. Aplicar
+-- numa única transação (-1): a reconstrução fica invisível até o COMMIT.
+
+-- Versão de linha: id da transação (txid_current) que gravou a linha por
+-- último. Usada no salvamento com concorrência otimista e no feed de
+-- alterações do Acompanhamento (grade_alteracoes.py).
+ALTER TABLE producao ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION producao_versao() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.versao := txid_current();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS producao_versao ON producao;
+CREATE TRIGGER producao_versao BEFORE INSERT OR UPDATE ON producao
+    FOR EACH ROW EXECUTE FUNCTION producao_versao();
+
+-- Ponto de partida da próxima leitura do feed: toda transação com id menor
+-- que o xmin do snapshot já terminou, então "versao >= desde" não perde
+-- gravações que ainda estavam em andamento (no máximo relê algumas linhas).
+-- Lido na mesma instrução que os dados, para valer para o snapshot deles.
+CREATE OR REPLACE VIEW producao_feed AS
+SELECT txid_snapshot_xmin(txid_current_snapshot()) AS desde;
+
+-- Seleção de origem (uma linha por linha de produção). Os status editados
+-- no Acompanhamento (texto) têm precedência sobre os ids gravados na Produção.
+CREATE OR REPLACE VIEW producao_leitura_fonte AS
+SELECT
+    pr.id,
+    p.numero_pedido,
+    ip.descricao,
+    pr.id_item_pedido,
+    ip.id_pedido,
+    p.hospital,
+    p.data_emissao,
+    ip.codigo_material,
+    ip.quantidade,
+    ip.valor_unitario,
+    pr.status_tecido_id,
+    pr.faturamento_id,
+    pr.logistica_id,
+    COALESCE(pr.status_tecido, st.nome) AS status_tecido,
+    COALESCE(pr.faturamento, sf.nome) AS faturamento,
+    COALESCE(pr.logistica, lg.nome) AS logistica,
+    pr.data_faturamento,
+    pr.nota_fiscal,
+    pr.ordem_fabricacao,
+    pr.quantidade_op,
+    pr.consumo,
+    pr.tecido,
+    pr.data_entrega,
+    pr.cor_prioridade,
+    pr.versao
+FROM producao pr
+JOIN itens_pedido ip ON pr.id_item_pedido = ip.id
+JOIN pedidos p ON ip.id_pedido = p.id
+LEFT JOIN status_tecido st ON pr.status_tecido_id = st.id
+LEFT JOIN status_faturamento sf ON pr.faturamento_id = sf.id
+LEFT JOIN logistica lg ON pr.logistica_id = lg.id;
+
+CREATE TABLE IF NOT EXISTS producao_leitura AS
+SELECT * FROM producao_leitura_fonte WITH NO DATA;
+
+-- Instalações anteriores à versão de linha (a coluna vai para o fim, como na view)
+ALTER TABLE producao_leitura ADD COLUMN IF NOT EXISTS versao bigint;
+
+CREATE UNIQUE INDEX IF NOT EXISTS producao_leitura_pkey ON producao_leitura (id);
+
+-- Ordenação da grade: keyset em (coluna, id)
+CREATE INDEX IF NOT EXISTS producao_leitura_numero_pedido_idx ON producao_leitura (numero_pedido, id);
+CREATE INDEX IF NOT EXISTS producao_leitura_data_entrega_idx ON producao_leitura (data_entrega, id);
+CREATE INDEX IF NOT EXISTS producao_leitura_cor_prioridade_idx ON producao_leitura (cor_prioridade, id);
+CREATE INDEX IF NOT EXISTS producao_leitura_status_tecido_idx ON producao_leitura (status_tecido, id);
+CREATE INDEX IF NOT EXISTS producao_leitura_faturamento_idx ON producao_leitura (faturamento, id);
+CREATE INDEX IF NOT EXISTS producao_leitura_logistica_idx ON producao_leitura (logistica, id);
+CREATE INDEX IF NOT EXISTS producao_leitura_id_item_pedido_idx ON producao_leitura (id_item_pedido);
+CREATE INDEX IF NOT EXISTS producao_leitura_id_pedido_idx ON producao_leitura (id_pedido);
+CREATE INDEX IF NOT EXISTS producao_leitura_versao_idx ON producao_leitura (versao);
+
+-- Filtros da grade: LOWER(CAST(coluna AS VARCHAR)) LIKE '%texto%' (trigramas)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS producao_leitura_numero_pedido_trgm ON producao_leitura USING gin (LOWER(CAST(numero_pedido AS VARCHAR)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS producao_leitura_descricao_trgm ON producao_leitura USING gin (LOWER(CAST(descricao AS VARCHAR)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS producao_leitura_nota_fiscal_trgm ON producao_leitura USING gin (LOWER(CAST(nota_fiscal AS VARCHAR)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS producao_leitura_ordem_fabricacao_trgm ON producao_leitura USING gin (LOWER(CAST(ordem_fabricacao AS VARCHAR)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS producao_leitura_tecido_trgm ON producao_leitura USING gin (LOWER(CAST(tecido AS VARCHAR)) gin_trgm_ops);
+
+-- Regrava as linhas de leitura das linhas de produção informadas
+CREATE OR REPLACE FUNCTION producao_leitura_atualizar(ids bigint[]) RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM producao_leitura WHERE id = ANY(ids);
+    INSERT INTO producao_leitura SELECT * FROM producao_leitura_fonte WHERE id = ANY(ids);
+END;
+$$;
+
+-- Gatilhos por comando (não por linha): disparam uma vez por comando SQL,
+-- a partir das tabelas de transição. Só compensa porque os gravadores em
+-- massa (prioridade, grade_alteracoes) usam um UPDATE ... FROM (VALUES ...)
+-- por lote (persistencia.atualizar_em_lote); um executemany dispararia o
+-- gatilho uma vez por linha
+CREATE OR REPLACE FUNCTION producao_leitura_gatilho() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'producao' AND TG_OP = 'DELETE' THEN
+        DELETE FROM producao_leitura WHERE id IN (SELECT id FROM antigas);
+    ELSIF TG_TABLE_NAME = 'producao' THEN
+        PERFORM producao_leitura_atualizar(ARRAY(SELECT id FROM novas));
+    ELSIF TG_TABLE_NAME = 'itens_pedido' THEN
+        PERFORM producao_leitura_atualizar(ARRAY(
+            SELECT pr.id FROM producao pr JOIN novas n ON pr.id_item_pedido = n.id));
+    ELSIF TG_TABLE_NAME = 'pedidos' THEN
+        PERFORM producao_leitura_atualizar(ARRAY(
+            SELECT pr.id FROM producao pr
+            JOIN itens_pedido ip ON pr.id_item_pedido = ip.id
+            JOIN novas n ON ip.id_pedido = n.id));
+    ELSIF TG_TABLE_NAME = 'status_tecido' THEN
+        PERFORM producao_leitura_atualizar(ARRAY(
+            SELECT pr.id FROM producao pr JOIN novas n ON pr.status_tecido_id = n.id));
+    ELSIF TG_TABLE_NAME = 'status_faturamento' THEN
+        PERFORM producao_leitura_atualizar(ARRAY(
+            SELECT pr.id FROM producao pr JOIN novas n ON pr.faturamento_id = n.id));
+    ELSIF TG_TABLE_NAME = 'logistica' THEN
+        PERFORM producao_leitura_atualizar(ARRAY(
+            SELECT pr.id FROM producao pr JOIN novas n ON pr.logistica_id = n.id));
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Tabelas de transição exigem um gatilho por evento
+DROP TRIGGER IF EXISTS producao_leitura_insert ON producao;
+CREATE TRIGGER producao_leitura_insert AFTER INSERT ON producao
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+DROP TRIGGER IF EXISTS producao_leitura_update ON producao;
+CREATE TRIGGER producao_leitura_update AFTER UPDATE ON producao
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+DROP TRIGGER IF EXISTS producao_leitura_delete ON producao;
+CREATE TRIGGER producao_leitura_delete AFTER DELETE ON producao
+    REFERENCING OLD TABLE AS antigas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+
+DROP TRIGGER IF EXISTS producao_leitura_update ON itens_pedido;
+CREATE TRIGGER producao_leitura_update AFTER UPDATE ON itens_pedido
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+DROP TRIGGER IF EXISTS producao_leitura_update ON pedidos;
+CREATE TRIGGER producao_leitura_update AFTER UPDATE ON pedidos
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+DROP TRIGGER IF EXISTS producao_leitura_update ON status_tecido;
+CREATE TRIGGER producao_leitura_update AFTER UPDATE ON status_tecido
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+DROP TRIGGER IF EXISTS producao_leitura_update ON status_faturamento;
+CREATE TRIGGER producao_leitura_update AFTER UPDATE ON status_faturamento
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+DROP TRIGGER IF EXISTS producao_leitura_update ON logistica;
+CREATE TRIGGER producao_leitura_update AFTER UPDATE ON logistica
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_leitura_gatilho();
+
+-- Reconstrução completa (primeira aplicação ou conferência)
+TRUNCATE producao_leitura;
+INSERT INTO producao_leitura SELECT * FROM producao_leitura_fonte;
+ANALYZE producao_leitura;
@@ -0,0 +1,163 @@
+-- Totais do painel de produção (paginas/painel.py): linhas, quantidade e
+-- valor (quantidade * valor_unitario) por cor de prioridade, status do
+-- tecido, faturamento, logística, hospital e semana de entrega.
+-- Mantidos por gatilhos no modelo de leitura (producao_leitura): cada comando
+-- acrescenta os seus totais (+ linhas novas, - linhas removidas) numa tabela
+-- de deltas só de inserção, que é somada ao resumo consolidado na leitura
+-- (producao_resumo_atual) e dobrada nele de tempos em tempos
+-- (producao_resumo_consolidar). O painel lê poucas centenas de linhas,
+-- qualquer que seja o tamanho da produção.
+-- Os gravadores não atualizam linhas compartilhadas do resumo: um upsert no
+-- gatilho travaria as mesmas linhas (uma por cor, por status...) até o COMMIT,
+-- enfileirando todas as gravações da produção e abrindo espaço para deadlock
+-- entre o DELETE e o INSERT de producao_leitura_atualizar.
+-- Aplicar depois de 002_producao_leitura.sql, também com psql -1 -f.
+
+-- Seleção completa (reconstrução e conferência). Valor nulo vira ''.
+CREATE OR REPLACE VIEW producao_resumo_fonte AS
+SELECT 'cor_prioridade' AS dimensao, COALESCE(CAST(cor_prioridade AS VARCHAR), '') AS valor,
+       COUNT(*) AS linhas, SUM(quantidade) AS quantidade, SUM(quantidade * valor_unitario) AS valor_total
+FROM producao_leitura GROUP BY 2
+UNION ALL
+SELECT 'status_tecido', COALESCE(CAST(status_tecido AS VARCHAR), ''),
+       COUNT(*), SUM(quantidade), SUM(quantidade * valor_unitario)
+FROM producao_leitura GROUP BY 2
+UNION ALL
+SELECT 'faturamento', COALESCE(CAST(faturamento AS VARCHAR), ''),
+       COUNT(*), SUM(quantidade), SUM(quantidade * valor_unitario)
+FROM producao_leitura GROUP BY 2
+UNION ALL
+SELECT 'logistica', COALESCE(CAST(logistica AS VARCHAR), ''),
+       COUNT(*), SUM(quantidade), SUM(quantidade * valor_unitario)
+FROM producao_leitura GROUP BY 2
+UNION ALL
+SELECT 'hospital', COALESCE(CAST(hospital AS VARCHAR), ''),
+       COUNT(*), SUM(quantidade), SUM(quantidade * valor_unitario)
+FROM producao_leitura GROUP BY 2
+UNION ALL
+SELECT 'semana_entrega', COALESCE(to_char(date_trunc('week', data_entrega), 'YYYY-MM-DD'), ''),
+       COUNT(*), SUM(quantidade), SUM(quantidade * valor_unitario)
+FROM producao_leitura GROUP BY 2;
+
+CREATE TABLE IF NOT EXISTS producao_resumo (
+    dimensao varchar NOT NULL,
+    valor varchar NOT NULL,
+    linhas bigint NOT NULL DEFAULT 0,
+    quantidade numeric NOT NULL DEFAULT 0,
+    valor_total numeric NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimensao, valor)
+);
+
+-- Deltas ainda não consolidados. Só recebem INSERT dos gatilhos (nenhuma
+-- trava disputada) e DELETE do consolidador.
+CREATE TABLE IF NOT EXISTS producao_resumo_delta (
+    id bigserial PRIMARY KEY,
+    dimensao varchar NOT NULL,
+    valor varchar NOT NULL,
+    linhas bigint NOT NULL,
+    quantidade numeric NOT NULL,
+    valor_total numeric NOT NULL
+);
+
+-- Totais atuais: consolidado + deltas pendentes (o que o painel lê). Correto
+-- a qualquer momento, consolidado ou não; só o volume lido muda.
+CREATE OR REPLACE VIEW producao_resumo_atual AS
+SELECT dimensao, valor, SUM(linhas) AS linhas, SUM(quantidade) AS quantidade, SUM(valor_total) AS valor_total
+FROM (
+    SELECT dimensao, valor, linhas, quantidade, valor_total FROM producao_resumo
+    UNION ALL
+    SELECT dimensao, valor, linhas, quantidade, valor_total FROM producao_resumo_delta
+) AS t
+GROUP BY dimensao, valor
+HAVING SUM(linhas) > 0;
+
+-- Acrescenta os totais das linhas novas (INSERT) ou, com sinal negativo, das
+-- removidas (DELETE). O modelo de leitura só recebe INSERT e DELETE
+-- (producao_leitura_atualizar regrava a linha) e TRUNCATE na reconstrução.
+-- A tabela de transição é lida pelo nome (EXECUTE), sem copiar as linhas.
+CREATE OR REPLACE FUNCTION producao_resumo_gatilho() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        -- Mesma trava do consolidador: não disputa linhas com ele
+        PERFORM pg_advisory_xact_lock(hashtext('producao_resumo_consolidar'));
+        DELETE FROM producao_resumo_delta;
+        DELETE FROM producao_resumo;
+        RETURN NULL;
+    END IF;
+
+    EXECUTE format($sql$
+        INSERT INTO producao_resumo_delta (dimensao, valor, linhas, quantidade, valor_total)
+        SELECT d.dimensao, COALESCE(d.valor, ''),
+               $1 * COUNT(*),
+               $1 * COALESCE(SUM(n.quantidade), 0),
+               $1 * COALESCE(SUM(n.quantidade * n.valor_unitario), 0)
+        FROM %I AS n
+        CROSS JOIN LATERAL (VALUES
+            ('cor_prioridade', CAST(n.cor_prioridade AS VARCHAR)),
+            ('status_tecido', CAST(n.status_tecido AS VARCHAR)),
+            ('faturamento', CAST(n.faturamento AS VARCHAR)),
+            ('logistica', CAST(n.logistica AS VARCHAR)),
+            ('hospital', CAST(n.hospital AS VARCHAR)),
+            ('semana_entrega', to_char(date_trunc('week', n.data_entrega), 'YYYY-MM-DD'))
+        ) AS d(dimensao, valor)
+        GROUP BY 1, 2
+    $sql$, CASE TG_OP WHEN 'INSERT' THEN 'novas' ELSE 'antigas' END)
+    USING CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END;
+    RETURN NULL;
+END;
+$$;
+
+-- Dobra os deltas já confirmados no resumo consolidado e os apaga. Deltas de
+-- transações em andamento não são visíveis e ficam para a próxima vez. Um
+-- consolidador por vez (trava consultiva); os demais desistem na hora, sem
+-- esperar. Chamado por esquema.consolidar_resumo: ao fim da atualização
+-- diária (prioridade.py) e de cada varredura do importador, e pelo painel
+-- (paginas/painel.py). Também pode ir num cron:
+-- SELECT producao_resumo_consolidar();
+CREATE OR REPLACE FUNCTION producao_resumo_consolidar() RETURNS bigint
+LANGUAGE plpgsql AS $$
+DECLARE
+    consolidadas bigint;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('producao_resumo_consolidar')) THEN
+        RETURN 0;
+    END IF;
+
+    WITH removidas AS (
+        DELETE FROM producao_resumo_delta
+        RETURNING dimensao, valor, linhas, quantidade, valor_total
+    )
+    INSERT INTO producao_resumo AS r (dimensao, valor, linhas, quantidade, valor_total)
+    SELECT dimensao, valor, SUM(linhas), SUM(quantidade), SUM(valor_total)
+    FROM removidas
+    GROUP BY dimensao, valor
+    ON CONFLICT (dimensao, valor) DO UPDATE SET
+        linhas = r.linhas + EXCLUDED.linhas,
+        quantidade = r.quantidade + EXCLUDED.quantidade,
+        valor_total = r.valor_total + EXCLUDED.valor_total;
+    GET DIAGNOSTICS consolidadas = ROW_COUNT;
+
+    DELETE FROM producao_resumo WHERE linhas <= 0;
+    RETURN consolidadas;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS producao_resumo_insert ON producao_leitura;
+CREATE TRIGGER producao_resumo_insert AFTER INSERT ON producao_leitura
+    REFERENCING NEW TABLE AS novas FOR EACH STATEMENT EXECUTE FUNCTION producao_resumo_gatilho();
+DROP TRIGGER IF EXISTS producao_resumo_delete ON producao_leitura;
+CREATE TRIGGER producao_resumo_delete AFTER DELETE ON producao_leitura
+    REFERENCING OLD TABLE AS antigas FOR EACH STATEMENT EXECUTE FUNCTION producao_resumo_gatilho();
+DROP TRIGGER IF EXISTS producao_resumo_truncate ON producao_leitura;
+CREATE TRIGGER producao_resumo_truncate AFTER TRUNCATE ON producao_leitura
+    FOR EACH STATEMENT EXECUTE FUNCTION producao_resumo_gatilho();
+
+-- Reconstrução completa. Reaplicar o 002 também reconstrói o resumo: o
+-- TRUNCATE do modelo de leitura zera os totais e o INSERT gera os deltas.
+SELECT pg_advisory_xact_lock(hashtext('producao_resumo_consolidar'));
+DELETE FROM producao_resumo_delta;
+DELETE FROM producao_resumo;
+INSERT INTO producao_resumo (dimensao, valor, linhas, quantidade, valor_total)
+SELECT dimensao, valor, linhas, COALESCE(quantidade, 0), COALESCE(valor_total, 0) FROM producao_resumo_fonte;
+ANALYZE producao_resumo;
@@ -0,0 +1,201 @@
+import datetime
+import json
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+from diagnostico import medir
+
+# === TAREFAS EM SEGUNDO PLANO ===
+# Operações longas (leitura de lote, gravação de lote, recálculo de
+# prioridades) rodam num pool de threads do processo, fora do script do
+# Streamlit: a página só submete e acompanha. Um pool por tipo de tarefa
+# limita quantas rodam ao mesmo tempo; as excedentes esperam na fila.
+# O estado (sem o resultado) é gravado em TAREFAS_ARQUIVO: depois de um
+# reinício do processo, o que estava em andamento aparece como interrompido.
+# Os resultados ficam só em memória, limitados a TAREFAS_RESULTADOS_MB no
+# total (os mais antigos saem primeiro); a página descarta o resultado que já
+# entregou. Resultado ausente numa tarefa concluída é tratado como o de uma
+# tarefa de antes do reinício.
+
+PENDENTE = "PENDENTE"
+EXECUTANDO = "EXECUTANDO"
+CONCLUIDA = "CONCLUÍDA"
+ERRO = "ERRO"
+INTERROMPIDA = "INTERROMPIDA"
+
+LIMITES_POR_TIPO = {
+    "extrair_pdf": 2,
+    "extrair_lote": 1,  # já usa um processo por núcleo
+    "salvar_lote": 1,
+    "prioridades": 1,
+    "exportacao": 2,
+    "indice_itens": 1,
+}
+LIMITE_PADRAO = 1
+MAX_HISTORICO = 200
+MAX_RESULTADOS_BYTES = int(os.getenv("TAREFAS_RESULTADOS_MB", "256")) * 1024 * 1024
+ARQUIVO_ESTADO = os.getenv("TAREFAS_ARQUIVO", ".tarefas.json")
+
+
+def _agora():
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+def _tamanho(valor):
+    # Tamanho serializado, como no cache de PDFs (extracao_pdf.guardar_extracao)
+    try:
+        return len(pickle.dumps(valor))
+    except Exception:
+        return 0
+
+
+@dataclass
+class Tarefa:
+    id: str
+    tipo: str
+    descricao: str
+    criada_em: str
+    estado: str = PENDENTE
+    progresso: float = 0.0
+    mensagem: str = ""
+    erro: str = None
+    iniciada_em: str = None
+    concluida_em: str = None
+    resultado: object = field(default=None, repr=False)  # só em memória, não é gravado
+
+    @property
+    def terminada(self):
+        return self.estado in (CONCLUIDA, ERRO, INTERROMPIDA)
+
+    def registro(self):
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "resultado"}
+
+
+class GerenciadorTarefas:
+    def __init__(self, arquivo=ARQUIVO_ESTADO, limites=LIMITES_POR_TIPO):
+        self.arquivo = Path(arquivo) if arquivo else None
+        self.limites = dict(limites)
+        self._tarefas = OrderedDict()
+        self._resultados = OrderedDict()  # id -> bytes, na ordem de conclusão
+        self._bytes_resultados = 0
+        self._pools = {}
+        self._lock = threading.RLock()
+        self._ultima_gravacao = 0.0
+        self._carregar()
+
+    def _carregar(self):
+        if self.arquivo is None or not self.arquivo.exists():
+            return
+        try:
+            registros = json.loads(self.arquivo.read_text(encoding="utf-8"))
+        except ValueError:
+            return
+        campos = {f.name for f in fields(Tarefa)}
+        for registro in registros:
+            tarefa = Tarefa(**{chave: valor for chave, valor in registro.items() if chave in campos})
+            if not tarefa.terminada:
+                tarefa.estado = INTERROMPIDA
+                tarefa.mensagem = "Processo reiniciado antes do fim da tarefa"
+            self._tarefas[tarefa.id] = tarefa
+
+    def _gravar(self, forcar=True):
+        # Mudanças de estado gravam sempre; o progresso, no máximo uma vez por segundo
+        if self.arquivo is None:
+            return
+        with self._lock:
+            agora = time.monotonic()
+            if not forcar and agora - self._ultima_gravacao < 1:
+                return
+            self._ultima_gravacao = agora
+            registros = [tarefa.registro() for tarefa in self._tarefas.values()]
+            temporario = self.arquivo.with_suffix(".tmp")
+            temporario.write_text(json.dumps(registros, ensure_ascii=False, default=str), encoding="utf-8")
+            os.replace(temporario, self.arquivo)
+
+    def _pool(self, tipo):
+        with self._lock:
+            if tipo not in self._pools:
+                self._pools[tipo] = ThreadPoolExecutor(
+                    max_workers=self.limites.get(tipo, LIMITE_PADRAO), thread_name_prefix=f"tarefa-{tipo}"
+                )
+            return self._pools[tipo]
+
+    def _podar(self):
+        terminadas = [t.id for t in self._tarefas.values() if t.terminada]
+        for id_tarefa in terminadas[:max(0, len(self._tarefas) - MAX_HISTORICO)]:
+            self.descartar_resultado(id_tarefa)
+            del self._tarefas[id_tarefa]
+
+    def _guardar_resultado(self, tarefa, resultado):
+        # O resultado recém-concluído sempre fica; os mais antigos saem até a
+        # soma voltar ao limite
+        tamanho = _tamanho(resultado)
+        with self._lock:
+            tarefa.resultado = resultado
+            self._resultados[tarefa.id] = tamanho
+            self._bytes_resultados += tamanho
+            while self._bytes_resultados > MAX_RESULTADOS_BYTES and len(self._resultados) > 1:
+                self.descartar_resultado(next(iter(self._resultados)))
+
+    def descartar_resultado(self, id_tarefa):
+        # Libera o resultado já entregue; a tarefa continua no histórico
+        with self._lock:
+            tamanho = self._resultados.pop(id_tarefa, None)
+            if tamanho is None:
+                return
+            self._bytes_resultados -= tamanho
+            tarefa = self._tarefas.get(id_tarefa)
+            if tarefa is not None:
+                tarefa.resultado = None
+
+    def submeter(self, tipo, descricao, funcao, *args, **kwargs):
+        # funcao(progresso, *args, **kwargs); progresso(fracao, mensagem=None) informa o andamento
+        tarefa = Tarefa(id=uuid.uuid4().hex[:12], tipo=tipo, descricao=descricao, criada_em=_agora())
+        with self._lock:
+            self._tarefas[tarefa.id] = tarefa
+            self._podar()
+        self._gravar()
+        self._pool(tipo).submit(self._executar, tarefa, funcao, args, kwargs)
+        return tarefa.id
+
+    def _executar(self, tarefa, funcao, args, kwargs):
+        def progresso(fracao, mensagem=None):
+            tarefa.progresso = max(0.0, min(1.0, float(fracao)))
+            if mensagem is not None:
+                tarefa.mensagem = mensagem
+            self._gravar(forcar=False)
+
+        tarefa.estado, tarefa.iniciada_em = EXECUTANDO, _agora()
+        self._gravar()
+        try:
+            with medir("tarefa", tarefa.tipo, tarefa=tarefa.id):
+                resultado = funcao(progresso, *args, **kwargs)
+            self._guardar_resultado(tarefa, resultado)
+            tarefa.estado, tarefa.progresso = CONCLUIDA, 1.0
+        except Exception as e:
+            tarefa.estado, tarefa.erro = ERRO, f"{type(e).__name__}: {e}"
+        finally:
+            tarefa.concluida_em = _agora()
+            self._gravar()
+
+    def obter(self, id_tarefa):
+        return self._tarefas.get(id_tarefa) if id_tarefa else None
+
+    def listar(self, tipo=None):
+        # Mais recentes primeiro
+        with self._lock:
+            tarefas = list(self._tarefas.values())
+        return [t for t in reversed(tarefas) if tipo is None or t.tipo == tipo]
+
+    def ativas(self, tipo=None):
+        return [t for t in self.listar(tipo) if not t.terminada]
+
+
+TAREFAS = GerenciadorTarefas()
@@ -0,0 +1,25 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Os módulos do app ficam na raiz do repositório; o banco semeado, em benchmarks/
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(RAIZ), str(RAIZ / "benchmarks")]
+os.environ["TAREFAS_ARQUIVO"] = ""  # tarefas só em memória durante os testes
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # Banco SQLite semeado (esquema, modelo de leitura e 200 linhas de produção)
+    from banco import conectar
+    from base_local import popular_banco
+    from cache import invalidar
+
+    engine = conectar(f"sqlite:///{tmp_path / 'teste.db'}")
+    popular_banco(engine, 200)
+    invalidar()
+    yield engine
+    invalidar()
+    engine.dispose()
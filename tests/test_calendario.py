@@ -0,0 +1,68 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calendario import (
+    _domingo_de_pascoa, adicionar_dias_uteis, adicionar_dias_uteis_vetorizado, calcular_cor_prioridade,
+    montar_feriados,
+)
+
+FERIADOS_RECIFE = montar_feriados("recife", ano_inicial=2023, ano_final=2026)
+
+
+def _laco_antigo(data, dias_uteis, feriados=()):
+    # Referência: o laço dia a dia que a versão vetorizada substituiu
+    feriados = set(feriados)
+    atual, adicionados = data, 0
+    while adicionados < dias_uteis:
+        atual += datetime.timedelta(days=1)
+        if atual.weekday() < 5 and atual not in feriados:
+            adicionados += 1
+    return atual
+
+
+DATAS = [datetime.date(2024, 1, 1) + datetime.timedelta(days=i) for i in range(0, 400, 3)]
+
+
+@pytest.mark.parametrize("feriados", [(), FERIADOS_RECIFE])
+@pytest.mark.parametrize("dias", [-30, -1, 0, 1, 2, 5, 19, 30])
+def test_igual_ao_laco_antigo(feriados, dias):
+    # Inclui datas de fim de semana e de feriado como ponto de partida;
+    # deslocamentos <= 0 devolvem a própria data, como no laço
+    esperado = [_laco_antigo(d, dias, feriados) for d in DATAS]
+    resultado = adicionar_dias_uteis_vetorizado(pd.Series(pd.to_datetime(DATAS)), dias, feriados)
+    assert [d.date() for d in resultado] == esperado
+    assert [adicionar_dias_uteis(d, dias, feriados) for d in DATAS[:10]] == esperado[:10]
+
+
+def test_deslocamento_por_linha_e_datas_nulas():
+    datas = pd.Series([pd.Timestamp("2024-03-01"), None, pd.Timestamp("2024-03-02")], index=[10, 20, 30])
+    resultado = adicionar_dias_uteis_vetorizado(datas, np.array([1, 5, -3]), feriados=())
+
+    assert list(resultado.index) == [10, 20, 30]
+    assert resultado[10] == pd.Timestamp("2024-03-04")
+    assert pd.isna(resultado[20])
+    assert resultado[30] == pd.Timestamp("2024-03-02")
+
+
+def test_cores_com_limites_negativos_iguais_a_entrega():
+    # Os limites usam deslocamentos negativos, que devolvem a própria entrega:
+    # até a entrega é AZUL, depois PRETO (comportamento do laço antigo)
+    hoje = datetime.date(2024, 6, 10)
+    entregas = pd.Series(pd.to_datetime(["2024-06-10", "2024-07-30", "2024-06-07", None]))
+    cores = calcular_cor_prioridade(entregas, hoje, feriados=())
+    assert cores[:3].tolist() == ["5.AZUL", "5.AZUL", "1.PRETO"]
+    assert pd.isna(cores[3])
+
+
+def test_pascoa_e_feriados_configurados():
+    assert _domingo_de_pascoa(2024) == datetime.date(2024, 3, 31)
+    assert _domingo_de_pascoa(2025) == datetime.date(2025, 4, 20)
+
+    feriados = montar_feriados("nacional", "2024-08-15, ", 2024, 2024)
+    assert datetime.date(2024, 2, 13) in feriados  # terça de Carnaval
+    assert datetime.date(2024, 8, 15) in feriados
+    with pytest.raises(ValueError):
+        montar_feriados("marte")
@@ -0,0 +1,130 @@
+import pandas as pd
+from sqlalchemy import text
+from st_aggrid.AgGridReturn import AgGridReturn
+
+from esquema import VALORES_REFERENCIA
+from grade_alteracoes import preparar_para_grade, salvar_diferencas
+from paginacao import CONSULTA_ACOMPANHAMENTO
+
+
+def _pagina(engine, tamanho=5):
+    # Como paginas/acompanhamento.py: quadro da sessão e quadro enviado à grade
+    df, _ = CONSULTA_ACOMPANHAMENTO.pagina(engine, tamanho=tamanho)
+    df = df.drop(columns="versao_desde")
+    return df, preparar_para_grade(df.drop(columns="versao"))
+
+
+def _ida_e_volta(df_grade, editar):
+    # Simula o AgGrid: o quadro vai como JSON, volta como objetos e o
+    # st_aggrid converte cada coluna de volta para o dtype original
+    linhas = df_grade.astype(object).where(df_grade.notna(), None).to_dict("records")
+    editar(linhas)
+    retorno = AgGridReturn(df_grade, frame_dtypes=df_grade.dtypes)
+    return retorno._convert_column_types(pd.DataFrame(linhas, dtype=object))
+
+
+def _valor_no_banco(engine, coluna, id_linha):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT {coluna} FROM producao_leitura WHERE id = :id"), {"id": id_linha}).scalar()
+
+
+def test_status_fora_da_pagina_sobrevive_a_grade(engine):
+    df, df_grade = _pagina(engine)
+    ausentes = [v for v in VALORES_REFERENCIA["status_tecido"] if v not in set(df["status_tecido"].dropna())]
+    novo = ausentes[0] if ausentes else VALORES_REFERENCIA["status_tecido"][0]
+    id_linha = int(df.loc[df["status_tecido"] != novo, "id"].iloc[0])
+
+    def editar(linhas):
+        next(l for l in linhas if l["id"] == id_linha)["status_tecido"] = novo
+
+    editado = _ida_e_volta(df_grade, editar)
+    with engine.begin() as conn:
+        gravadas, conflitos, invalidas = salvar_diferencas(conn, df, editado)
+
+    assert (gravadas, conflitos, invalidas) == (1, [], [])
+    assert _valor_no_banco(engine, "status_tecido", id_linha) == novo
+
+
+def test_grade_sem_edicao_nao_grava_nada(engine):
+    df, df_grade = _pagina(engine)
+    editado = _ida_e_volta(df_grade, lambda linhas: None)
+    with engine.begin() as conn:
+        assert salvar_diferencas(conn, df, editado) == (0, [], [])
+
+
+def test_numero_com_virgula_passa_pela_grade(engine):
+    df, df_grade = _pagina(engine)
+    id_linha = int(df["id"].iloc[0])
+
+    def editar(linhas):
+        linhas[0]["consumo"] = "1,5"
+
+    editado = _ida_e_volta(df_grade, editar)
+    with engine.begin() as conn:
+        assert salvar_diferencas(conn, df, editado)[0] == 1
+    assert _valor_no_banco(engine, "consumo", id_linha) == 1.5
+
+
+def test_numero_invalido_e_rejeitado_sem_gravar(engine):
+    df, df_grade = _pagina(engine)
+    id_linha = int(df["id"].iloc[0])
+    antes = _valor_no_banco(engine, "consumo", id_linha)
+
+    def editar(linhas):
+        linhas[0]["consumo"] = "abc"
+
+    editado = _ida_e_volta(df_grade, editar)
+    with engine.begin() as conn:
+        gravadas, _, invalidas = salvar_diferencas(conn, df, editado)
+    assert gravadas == 0
+    assert invalidas == [{"id": id_linha, "coluna": "consumo", "valor": "abc"}]
+    assert _valor_no_banco(engine, "consumo", id_linha) == antes
+
+
+# === calcular_diferencas (sem banco) ===
+def _quadros():
+    original = pd.DataFrame({
+        "id": [1, 2, 3],
+        "status_tecido": ["COMPRADO", None, "CORTADO"],
+        "quantidade_op": [10, 20, 30],
+        "consumo": [1.0, None, 2.5],
+    })
+    return original, original.astype(object)
+
+
+COLUNAS = ["status_tecido", "quantidade_op", "consumo"]
+
+
+def test_vazios_equivalentes_nao_contam_como_alteracao():
+    from grade_alteracoes import calcular_diferencas
+
+    original, editado = _quadros()
+    editado.loc[1, "status_tecido"] = ""
+    editado.loc[1, "consumo"] = ""
+    mascara, _, invalidas = calcular_diferencas(original, editado, COLUNAS)
+    assert mascara.empty and invalidas == []
+
+
+def test_so_colunas_alteradas_sao_marcadas():
+    from grade_alteracoes import calcular_diferencas
+
+    original, editado = _quadros()
+    editado.loc[0, "consumo"] = "1,25"
+    editado.loc[2, "quantidade_op"] = "31"
+    mascara, valores, _ = calcular_diferencas(original, editado, COLUNAS)
+    assert mascara.to_dict("index") == {
+        1: {"status_tecido": False, "quantidade_op": False, "consumo": True},
+        3: {"status_tecido": False, "quantidade_op": True, "consumo": False},
+    }
+    assert valores.loc[1, "consumo"] == 1.25 and valores.loc[3, "quantidade_op"] == 31
+
+
+def test_inteiro_fracionario_e_texto_sao_rejeitados():
+    from grade_alteracoes import calcular_diferencas
+
+    original, editado = _quadros()
+    editado.loc[0, "quantidade_op"] = "2.5"
+    editado.loc[2, "consumo"] = "1.234,5"
+    mascara, _, invalidas = calcular_diferencas(original, editado, COLUNAS)
+    assert mascara.empty
+    assert [(i["id"], i["coluna"]) for i in invalidas] == [(1, "quantidade_op"), (3, "consumo")]
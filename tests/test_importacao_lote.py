@@ -0,0 +1,55 @@
+import pytest
+
+import importacao_lote
+from extracao_pdf import PDFS, guardar_extracao, hash_conteudo
+from gerador_pdf import gerar_pedido_pdf
+from importacao_lote import (
+    STATUS_DUPLICADO_LOTE, STATUS_ERRO, STATUS_JA_IMPORTADO, STATUS_OK, classificar_lote, extrair_lote,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_vazio():
+    PDFS.invalidar()
+    yield
+    PDFS.invalidar()
+
+
+def _sem_pool(monkeypatch):
+    # Falha se o lote for ao pool de processos: tudo deve sair do cache
+    def pool(*args, **kwargs):
+        raise AssertionError("leitura fora do cache")
+    monkeypatch.setattr(importacao_lote, "ProcessPoolExecutor", pool)
+
+
+def test_leitura_nova_e_depois_do_cache():
+    conteudo = gerar_pedido_pdf("4500123456", n_itens=3, semente=1)
+    lido, = extrair_lote([("a.pdf", conteudo)], max_workers=1)
+    assert lido["erro"] is None and lido["pedido"]["numero_pedido"] == "4500123456"
+
+    progresso = []
+    do_cache, = extrair_lote([("b.pdf", conteudo)], ao_progredir=lambda *a: progresso.append(a[:2]))
+    assert do_cache == {**lido, "arquivo": "b.pdf"}
+    assert progresso == [(1, 1)]
+
+
+def test_extracao_do_cache_sem_numero_vira_erro(monkeypatch):
+    # O cache também é preenchido pela leitura avulsa, que não valida o número
+    conteudo = b"%PDF sem numero"
+    guardar_extracao(hash_conteudo(conteudo), ({"numero_pedido": "", "hospital": "X"}, []))
+    _sem_pool(monkeypatch)
+
+    resultado, = extrair_lote([("sem_numero.pdf", conteudo)])
+    assert resultado["pedido"] is None
+    assert resultado["erro"] == "ValueError: Número do pedido não encontrado no PDF"
+    assert classificar_lote([resultado])[0]["status"] == STATUS_ERRO
+
+
+def test_classificar_lote_marca_repetidos_e_existentes(monkeypatch):
+    extracoes = {b"1": "100", b"2": "100", b"3": "200"}
+    for conteudo, numero in extracoes.items():
+        guardar_extracao(hash_conteudo(conteudo), ({"numero_pedido": numero}, []))
+    _sem_pool(monkeypatch)
+
+    resultados = classificar_lote(extrair_lote([(c.decode(), c) for c in extracoes]), ja_importados=[200])
+    assert [r["status"] for r in resultados] == [STATUS_OK, STATUS_DUPLICADO_LOTE, STATUS_JA_IMPORTADO]
@@ -0,0 +1,76 @@
+import json
+import os
+
+import pytest
+
+import importador
+from extracao_pdf import PDFS, hash_conteudo
+from gerador_pdf import gerar_pedido_pdf
+from importador import Checkpoint, importar_arquivos, listar_pdfs, novo_resumo
+
+
+@pytest.fixture
+def pasta(tmp_path):
+    pasta = tmp_path / "entrada"
+    pasta.mkdir()
+    for i in range(2):
+        (pasta / f"pedido_{i}.pdf").write_bytes(gerar_pedido_pdf(f"999000000{i}", n_itens=2, semente=i))
+    PDFS.invalidar()
+    yield pasta
+    PDFS.invalidar()
+
+
+def _varrer(engine, pasta, checkpoint):
+    resumo = novo_resumo()
+    importar_arquivos(engine, listar_pdfs(pasta), checkpoint, resumo, workers=1)
+    return resumo
+
+
+def test_checkpoint_antigo_so_com_hashes(tmp_path):
+    arquivo = tmp_path / "checkpoint.json"
+    arquivo.write_text(json.dumps({"abc": {"arquivo": "a.pdf", "status": "importado"}}), encoding="utf-8")
+
+    checkpoint = Checkpoint(arquivo)
+    assert "abc" in checkpoint and checkpoint.arquivos == {}
+    checkpoint.salvar()
+    assert set(json.loads(arquivo.read_text(encoding="utf-8"))) == {"conteudos", "arquivos"}
+
+
+def test_varredura_seguinte_pula_arquivos_vistos(engine, pasta, tmp_path, monkeypatch):
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json")
+    resumo = _varrer(engine, pasta, checkpoint)
+    assert resumo["totais"] == {"importados": 2, "duplicados": 0, "falhas": 0}
+
+    # Mesmo tamanho e mtime: nem lido nem com hash calculado
+    def sem_hash(conteudo):
+        raise AssertionError("arquivo já visto foi lido de novo")
+    monkeypatch.setattr(importador, "hash_conteudo", sem_hash)
+    resumo = _varrer(engine, pasta, Checkpoint(tmp_path / "checkpoint.json"))
+    assert resumo["ja_processados"] == 2 and resumo["totais"]["importados"] == 0
+
+    # Regravado com o mesmo conteúdo: lido, mas o hash já está no checkpoint
+    monkeypatch.setattr(importador, "hash_conteudo", hash_conteudo)
+    arquivo = pasta / "pedido_0.pdf"
+    os.utime(arquivo, ns=(arquivo.stat().st_atime_ns, arquivo.stat().st_mtime_ns + 10**9))
+    resumo = _varrer(engine, pasta, checkpoint)
+    assert resumo["ja_processados"] == 2 and resumo["totais"]["importados"] == 0
+
+
+def test_arquivos_removidos_saem_do_checkpoint(engine, pasta, tmp_path):
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json")
+    _varrer(engine, pasta, checkpoint)
+    (pasta / "pedido_1.pdf").unlink()
+
+    _varrer(engine, pasta, checkpoint)
+    assert list(Checkpoint(tmp_path / "checkpoint.json").arquivos) == [str(pasta / "pedido_0.pdf")]
+    assert len(checkpoint.registros) == 2  # os hashes ficam: o conteúdo continua importado
+
+
+def test_resumo_guarda_totais_e_os_ultimos_arquivos(monkeypatch):
+    monkeypatch.setattr(importador, "MAX_ARQUIVOS_RESUMO", 3)
+    resumo = novo_resumo()
+    for i in range(10):
+        importador._anotar(resumo, "importados", {"arquivo": f"{i}.pdf"})
+
+    assert resumo["totais"]["importados"] == 10
+    assert [a["arquivo"] for a in resumo["importados"]] == ["7.pdf", "8.pdf", "9.pdf"]
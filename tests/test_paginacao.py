@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import text
+
+from paginacao import CONSULTA_TABELA_GERAL
+
+
+def _todas_as_paginas(engine, consulta, tamanho=7, **kwargs):
+    ids, cursor = [], None
+    while True:
+        df, cursor = consulta.pagina(engine, cursor=cursor, tamanho=tamanho, **kwargs)
+        ids.extend(int(i) for i in df["id"])
+        if cursor is None:
+            return ids
+
+
+def _ids(engine, where="1 = 1", params=None):
+    with engine.connect() as conn:
+        return {i for i, in conn.execute(text(f"SELECT id FROM producao_leitura WHERE {where}"), params or {})}
+
+
+@pytest.mark.parametrize("ordem", [None, ("nota_fiscal", True), ("status_tecido", False), ("quantidade", True)])
+def test_keyset_percorre_tudo_sem_repetir(engine, ordem):
+    # Colunas com nulos e valores repetidos: o desempate pela chave não pode pular nem repetir
+    ids = _todas_as_paginas(engine, CONSULTA_TABELA_GERAL, ordem=ordem)
+    assert len(ids) == len(set(ids))
+    assert set(ids) == _ids(engine)
+
+
+def test_nulos_ficam_no_fim(engine):
+    ids = _todas_as_paginas(engine, CONSULTA_TABELA_GERAL, ordem=("nota_fiscal", False))
+    nulos = _ids(engine, "nota_fiscal IS NULL")
+    assert nulos and set(ids[-len(nulos):]) == nulos
+
+
+def test_filtro_por_trecho_sem_diferenciar_maiusculas(engine):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE producao SET nota_fiscal = 'NF-Abc-1' WHERE id IN (1, 2)"))
+    ids = _todas_as_paginas(engine, CONSULTA_TABELA_GERAL, filtros={"nota_fiscal": " abc "})
+    assert sorted(ids) == [1, 2]
+    assert CONSULTA_TABELA_GERAL.total(engine, {"nota_fiscal": "abc"}) == (2, False)
+
+
+@pytest.mark.parametrize("filtro, esperados", [("50%", [1]), ("a_b", [2]), ("c\\d", [3]), ("%", [1]), ("_", [2])])
+def test_curingas_digitados_valem_como_texto(engine, filtro, esperados):
+    valores = {1: "DESC 50% OFF", 2: "LOTE A_B", 3: "C\\D", 4: "LOTE AXB 500"}
+    with engine.begin() as conn:
+        for id_linha, valor in valores.items():
+            conn.execute(text("UPDATE producao SET nota_fiscal = :v WHERE id = :id"), {"v": valor, "id": id_linha})
+    assert sorted(_todas_as_paginas(engine, CONSULTA_TABELA_GERAL, filtros={"nota_fiscal": filtro})) == esperados
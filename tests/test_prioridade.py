@@ -0,0 +1,19 @@
+import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+import persistencia
+from prioridade import SQL_BASE, atualizar_prioridades_diario, calcular_alteracoes
+
+
+def test_atualizacao_diaria_grava_em_lotes_e_converge(engine, monkeypatch):
+    # Lotes pequenos: o UPDATE ... FROM (VALUES ...) roda várias vezes
+    monkeypatch.setattr(persistencia, "LINHAS_POR_UPDATE", 7)
+    hoje = datetime.date.today() + datetime.timedelta(days=40)
+
+    assert atualizar_prioridades_diario(engine, hoje) > 7
+    with engine.connect() as conn:
+        df = pd.read_sql(text(SQL_BASE), conn)
+    assert calcular_alteracoes(df, hoje).empty
+    assert atualizar_prioridades_diario(engine, hoje) == 0
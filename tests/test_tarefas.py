@@ -0,0 +1,48 @@
+import time
+
+import tarefas
+from tarefas import CONCLUIDA, GerenciadorTarefas
+
+
+def _esperar(gerenciador, id_tarefa):
+    limite = time.monotonic() + 10
+    while not gerenciador.obter(id_tarefa).terminada:
+        assert time.monotonic() < limite
+        time.sleep(0.01)
+    return gerenciador.obter(id_tarefa)
+
+
+def _bytes(progresso, tamanho):
+    return b"x" * tamanho
+
+
+def test_resultados_limitados_em_bytes(monkeypatch):
+    monkeypatch.setattr(tarefas, "MAX_RESULTADOS_BYTES", 250_000)
+    gerenciador = GerenciadorTarefas(arquivo=None)
+
+    ids = [gerenciador.submeter("teste", f"t{i}", _bytes, 100_000) for i in range(4)]
+    concluidas = [_esperar(gerenciador, i) for i in ids]
+
+    assert all(t.estado == CONCLUIDA for t in concluidas)
+    assert [t.resultado is not None for t in concluidas] == [False, False, True, True]
+    assert gerenciador._bytes_resultados <= tarefas.MAX_RESULTADOS_BYTES
+
+
+def test_resultado_maior_que_o_limite_fica_ate_o_proximo(monkeypatch):
+    monkeypatch.setattr(tarefas, "MAX_RESULTADOS_BYTES", 1_000)
+    gerenciador = GerenciadorTarefas(arquivo=None)
+
+    grande = _esperar(gerenciador, gerenciador.submeter("teste", "grande", _bytes, 10_000))
+    assert grande.resultado is not None
+    _esperar(gerenciador, gerenciador.submeter("teste", "pequeno", _bytes, 10))
+    assert grande.resultado is None
+
+
+def test_descartar_resultado_entregue():
+    gerenciador = GerenciadorTarefas(arquivo=None)
+    tarefa = _esperar(gerenciador, gerenciador.submeter("teste", "t", _bytes, 1_000))
+
+    gerenciador.descartar_resultado(tarefa.id)
+    gerenciador.descartar_resultado(tarefa.id)  # repetir não tem efeito
+    assert tarefa.resultado is None and tarefa.estado == CONCLUIDA
+    assert gerenciador._bytes_resultados == 0